@@ -0,0 +1,109 @@
+"""Compare the WAV/pydub/base64 audio path with the PCM16 buffer path.
+
+Run from the repository root:
+
+    python -m benchmarks.audio_pipeline --seconds 30
+"""
+import io
+import json
+import time
+import base64
+import argparse
+
+import numpy as np
+import soundfile as sf
+from pydub import AudioSegment
+
+from realtime_example.audio_buffer import SAMPLE_RATE, PCMBuffer, b64encode_pcm, to_realtime_pcm16
+
+
+def legacy_upload(audio_np, sample_rate):
+    copied = 0
+    with io.BytesIO() as buffer:
+        sf.write(buffer, audio_np, samplerate=sample_rate, format='WAV')
+        buffer.seek(0)
+        wav_bytes = buffer.read()
+    copied += 2 * len(wav_bytes)  # BytesIO contents, then read() copy
+    pcm_base64 = base64.b64encode(wav_bytes).decode('utf-8')
+    copied += 2 * len(pcm_base64)  # bytes result, then str decode
+    event = json.dumps({"type": "conversation.item.create", "item": {"content": [{"audio": pcm_base64}]}})
+    copied += len(event)
+    return event, copied
+
+
+def buffer_upload(audio_np, sample_rate):
+    copied = 0
+    pcm = to_realtime_pcm16(audio_np, sample_rate)
+    if pcm is not audio_np:
+        copied += pcm.nbytes
+    pcm_base64 = b64encode_pcm(pcm)
+    copied += 2 * len(pcm_base64)
+    event = json.dumps({"type": "conversation.item.create", "item": {"content": [{"audio": pcm_base64}]}})
+    copied += len(event)
+    return event, copied
+
+
+def legacy_download(deltas):
+    copied = 0
+    full_audio_base64 = ''.join(deltas)
+    copied += len(full_audio_base64)
+    audio_data = base64.b64decode(full_audio_base64)
+    copied += len(audio_data)
+    audio_segment = AudioSegment.from_raw(io.BytesIO(audio_data), sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+    copied += 2 * len(audio_data)  # BytesIO and AudioSegment copies
+    with io.BytesIO() as buffered:
+        audio_segment.export(buffered, format="wav")
+        wav = buffered.getvalue()
+    copied += 2 * len(wav)
+    return wav, copied
+
+
+def buffer_download(deltas):
+    copied = 0
+    buffer = PCMBuffer()
+    for delta in deltas:
+        before = len(buffer._data)
+        buffer.append_b64(delta)
+        copied += 2 * len(delta) * 3 // 4  # decoded bytes, then copy into buffer
+        if len(buffer._data) != before:
+            copied += before
+    samples = buffer.samples()
+    return samples, copied
+
+
+def measure(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _, copied = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, copied
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    audio_np = (rng.standard_normal(args.seconds * args.input_rate) * 3000).astype(np.int16)
+    reply = (rng.standard_normal(args.seconds * SAMPLE_RATE) * 3000).astype(np.int16)
+    chunk = SAMPLE_RATE * 2 * args.delta_ms // 1000
+    raw = reply.tobytes()
+    deltas = [base64.b64encode(raw[i:i + chunk]).decode('ascii') for i in range(0, len(raw), chunk)]
+
+    rows = [
+        ("upload (legacy WAV)", legacy_upload, (audio_np, args.input_rate)),
+        ("upload (PCM16 buffer)", buffer_upload, (audio_np, args.input_rate)),
+        ("reply (legacy pydub)", legacy_download, (deltas,)),
+        ("reply (PCMBuffer)", buffer_download, (deltas,)),
+    ]
+    print(f"{args.seconds}s of audio, mic at {args.input_rate} Hz, {args.delta_ms} ms deltas")
+    print(f"{'path':<24}{'ms/audio-s':>12}{'MB copied':>12}")
+    for name, fn, fn_args in rows:
+        elapsed, copied = measure(fn, *fn_args)
+        print(f"{name:<24}{elapsed * 1000 / args.seconds:>12.3f}{copied / 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--input-rate", type=int, default=48000)
+    parser.add_argument("--delta-ms", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,84 @@
+"""Measure how much reply audio is still heard after the user barges in.
+
+Run from the repository root, against the mock server:
+
+    python -m benchmarks.barge_in --reply-seconds 10 --after-ms 1500 --lead-ms 0,250,500,1000
+
+The mock streams each reply faster than real time (--speed), as the
+API does, and main.py is interrupted --after-ms into playback. For each
+playback lead this reports the audio already handed to the browser but not
+yet played (what the user still hears), the time until the cancelled
+response is done, and any audio yielded after the interruption. A lead of
+0 disables pacing, so everything received so far is already buffered.
+"""
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+from realtime_example.mock_realtime_server import MockRealtimeServer
+from benchmarks.vad import synthetic_speech
+from benchmarks.realtime import FakeRequest
+
+
+async def barge_in_turn(app, request, after_s):
+    audio = (24000, synthetic_speech(2, np.random.default_rng(0)))
+    outputs = []
+
+    async def play():
+        async for output, _ in app.voice_chat_response(audio, [], request):
+            if output is not None:
+                outputs.append((time.perf_counter(), len(output[1])))
+
+    task = asyncio.create_task(play())
+    while not outputs:
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(after_s)
+
+    reply = app.active_replies[request.session_hash]
+    interrupted = time.perf_counter()
+    await app.interrupt_reply(request.session_hash)
+    await task
+    done = time.perf_counter()
+    late = sum(samples for at, samples in outputs if at > interrupted)
+    return {
+        "heard_after_ms": reply.buffered_ms,
+        "truncated_at_ms": reply.audio_end_ms,
+        "cancel_ms": round((done - interrupted) * 1000, 1),
+        "late_audio_ms": late * 1000 // 24000,
+    }
+
+
+async def main(args):
+    server = MockRealtimeServer(reply_seconds=args.reply_seconds, chunk_ms=50, delta_interval=0.05 / args.speed)
+    async with server:
+        from realtime_example import main as app
+        app.session_pool.url = server.url
+        app.session_pool.headers = {}
+        app.session_pool.warm_size = 0
+
+        print(f"{args.reply_seconds:.0f}s reply streamed at {args.speed:g}x real time, "
+              f"interrupted {args.after_ms} ms into playback; without barge-in "
+              f"{args.reply_seconds * 1000 - args.after_ms:.0f} ms would still play")
+        for lead_ms in args.lead_ms:
+            app.PLAYBACK_LEAD_MS = lead_ms
+            results = [
+                await barge_in_turn(app, FakeRequest(f"barge-in-{lead_ms}-{n}"), args.after_ms / 1000)
+                for n in range(args.turns)
+            ]
+            summary = {key: round(float(np.mean([r[key] for r in results])), 1) for key in results[0]}
+            print(f"lead {lead_ms:>5} ms: {summary}")
+            for n in range(args.turns):
+                await app.session_pool.close_conversation(f"barge-in-{lead_ms}-{n}")
+        await app.session_pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reply-seconds", type=float, default=10.0)
+    parser.add_argument("--speed", type=float, default=4.0, help="how much faster than real time the mock streams")
+    parser.add_argument("--after-ms", type=int, default=1500)
+    parser.add_argument("--lead-ms", type=lambda s: [int(v) for v in s.split(",")], default=[0, 250, 500, 1000])
+    parser.add_argument("--turns", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""Check that concurrent transcriptions each get back their own transcript.
+
+Run from the repository root:
+
+    python -m benchmarks.concurrent_transcription --calls 64 --concurrency 32
+
+The Whisper client is faked: it sleeps --api-ms, then answers with a
+fingerprint of the WAV bytes it was sent. Every clip is first transcribed
+alone to learn its fingerprint, then all of them at once through
+transcribe_pcm, with and without a transcript cache; any caller that gets
+another clip's fingerprint back is reported and the check exits non-zero.
+"""
+import sys
+import time
+import asyncio
+import hashlib
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.vad import synthetic_speech
+from realtime_example.transcription import ApiTranscriber, TranscriptCache, transcribe_pcm
+
+
+class FingerprintTranscriptions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, model, file):
+        name, wav, content_type = file
+        time.sleep(self.latency)
+        return SimpleNamespace(text=hashlib.sha256(bytes(wav)).hexdigest()[:16])
+
+
+async def check(label, clips, expected, transcriber, cache, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(pcm):
+        async with semaphore:
+            return await transcribe_pcm(pcm, transcriber, cache)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(pcm) for pcm in clips))
+    elapsed = time.perf_counter() - started
+    wrong = [i for i, (got, want) in enumerate(zip(results, expected)) if got != want]
+    print(f"{label:>14}: {len(clips)} calls in {elapsed:.2f}s, {len(wrong)} got another clip's transcript")
+    return not wrong
+
+
+async def main(args):
+    rng = np.random.default_rng(0)
+    clips = [synthetic_speech(args.seconds, rng).tobytes() for _ in range(args.calls)]
+    client = SimpleNamespace(audio=SimpleNamespace(transcriptions=FingerprintTranscriptions(args.api_ms / 1000)))
+    transcriber = ApiTranscriber(lambda: client)
+
+    expected = [await transcribe_pcm(pcm, transcriber) for pcm in clips]
+    if len(set(expected)) != len(clips):
+        sys.exit("Clips are not distinguishable by fingerprint; use longer --seconds.")
+
+    ok = await check("no cache", clips, expected, transcriber, None, args.concurrency)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TranscriptCache(cache_dir)
+        ok &= await check("cache, cold", clips, expected, transcriber, cache, args.concurrency)
+        ok &= await check("cache, warm", clips, expected, transcriber, cache, args.concurrency)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=64)
+    parser.add_argument("--seconds", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--api-ms", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""Compare receive-loop parsing of a long reply: json.loads + join vs the event dispatcher.
+
+Run from the repository root:
+
+    python -m benchmarks.event_parsing --seconds 300 --chunk-ms 50
+
+Frames are laid out like the API's response.audio.delta events. Each
+available JSON backend is timed separately; peak memory is measured with
+tracemalloc in a second pass so tracing does not skew the timings.
+"""
+import json
+import time
+import base64
+import asyncio
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from realtime_example.audio_buffer import SAMPLE_RATE, PCMBuffer
+from realtime_example.realtime_events import STOP, EventDispatcher, EventParser
+
+
+def reply_frames(seconds, chunk_ms):
+    rng = np.random.default_rng(0)
+    pcm = (rng.standard_normal(SAMPLE_RATE * seconds) * 3000).astype(np.int16).tobytes()
+    chunk = SAMPLE_RATE * 2 * chunk_ms // 1000
+    frames = []
+    for index, offset in enumerate(range(0, len(pcm), chunk)):
+        frames.append(json.dumps({
+            "type": "response.audio.delta",
+            "event_id": f"event_{index:08d}",
+            "response_id": "resp_0001",
+            "item_id": "item_0001",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": base64.b64encode(pcm[offset:offset + chunk]).decode('ascii'),
+        }))
+    frames.append(json.dumps({"type": "response.audio.done", "response_id": "resp_0001", "item_id": "item_0001"}))
+    frames.append(json.dumps({"type": "response.done", "response": {"id": "resp_0001", "usage": {}}}))
+    return frames, len(pcm)
+
+
+async def legacy(frames):
+    audio_parts = []
+    for message in frames:
+        event = json.loads(message)
+        if event.get('type') == 'response.audio.delta':
+            audio_parts.append(event['delta'])
+        elif event.get('type') == 'response.audio.done':
+            audio = base64.b64decode(''.join(audio_parts))
+        elif event.get('type') == 'response.done':
+            return len(audio)
+
+
+async def dispatched(frames, parser):
+    audio = PCMBuffer()
+    events = EventDispatcher(parser)
+    events.on('response.audio.delta')(lambda event: audio.append_b64(event.delta))
+    events.on('response.done')(lambda event: STOP)
+    for message in frames:
+        if await events.dispatch(message) is STOP:
+            return len(audio)
+
+
+def measure(run, frames):
+    started = time.perf_counter()
+    size = asyncio.run(run(frames))
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    asyncio.run(run(frames))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def main(args):
+    frames, pcm_bytes = reply_frames(args.seconds, args.chunk_ms)
+    wire = sum(len(frame) for frame in frames)
+    print(f"{args.seconds}s reply: {len(frames)} frames, {wire / 1e6:.1f} MB on the wire, "
+          f"{pcm_bytes / 1e6:.1f} MB of PCM")
+
+    runs = [("json.loads + join", legacy)]
+    for backend in ("json", "orjson", "msgspec"):
+        try:
+            parser = EventParser(backend)
+        except ImportError:
+            print(f"{backend} not installed, skipping")
+            continue
+        runs.append((f"dispatcher ({backend})", lambda frames, parser=parser: dispatched(frames, parser)))
+
+    for label, run in runs:
+        size, elapsed, peak = measure(run, frames)
+        assert size == pcm_bytes, (label, size)
+        print(f"{label:>22}: {len(frames) / elapsed:>9.0f} frames/s, "
+              f"{elapsed * 1000:7.1f} ms, peak {peak / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=300)
+    parser.add_argument("--chunk-ms", type=int, default=50)
+    main(parser.parse_args())
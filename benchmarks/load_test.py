@@ -0,0 +1,94 @@
+"""Drive many concurrent voice sessions against the mock Realtime server.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --sessions 50 --turns 3
+"""
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+from realtime_example.mock_realtime_server import MockRealtimeServer
+from benchmarks.vad import synthetic_speech
+
+
+class FakeRequest:
+    def __init__(self, session_hash):
+        self.session_hash = session_hash
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    values = np.percentile(np.asarray(samples) * 1000, [50, 95, 99])
+    return {"p50": values[0], "p95": values[1], "p99": values[2]}
+
+
+async def run_session(app, index, turns, think_time, latencies, first_audio, errors):
+    request = FakeRequest(f"load-{index}")
+    rng = np.random.default_rng(index)
+    history = []
+    for _ in range(turns):
+        audio = (24000, synthetic_speech(2, rng))
+        started = time.perf_counter()
+        first = None
+        try:
+            async for _, history in app.voice_chat_response(audio, history, request):
+                if first is None:
+                    first = time.perf_counter() - started
+        except Exception as e:
+            errors.append(repr(e))
+            continue
+        latencies.append(time.perf_counter() - started)
+        if first is not None:
+            first_audio.append(first)
+        await asyncio.sleep(think_time)
+    await app.end_conversation(request)
+
+
+async def main(args):
+    server = MockRealtimeServer(
+        reply_seconds=args.reply_seconds,
+        chunk_ms=args.chunk_ms,
+        delta_interval=args.delta_interval,
+    )
+    async with server:
+        from realtime_example import main as app
+        app.session_pool.url = server.url
+        app.session_pool.headers = {}
+        # Measure transport, not playback pacing
+        app.PLAYBACK_LEAD_MS = 0
+
+        latencies, first_audio, errors = [], [], []
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            run_session(app, i, args.turns, args.think_time, latencies, first_audio, errors)
+            for i in range(args.sessions)
+        ))
+        elapsed = time.perf_counter() - started
+
+        print(f"{args.sessions} sessions x {args.turns} turns in {elapsed:.2f}s "
+              f"({len(latencies) / elapsed:.1f} turns/s, {len(errors)} errors)")
+        for name, samples in (("turn latency", latencies), ("first audio", first_audio)):
+            stats = percentiles(samples)
+            if stats:
+                print(f"{name:>13}: " + "  ".join(f"{k}={v:.1f}ms" for k, v in stats.items()))
+        print(f"session pool: {app.session_pool.stats()}")
+        print(f"limiter: {app.turn_limiter.stats()}")
+        print(f"server connections: {server.connections}")
+        if errors:
+            print(f"first error: {errors[0]}")
+        await app.session_pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--think-time", type=float, default=0.1)
+    parser.add_argument("--reply-seconds", type=float, default=2.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--delta-interval", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""Compare sequential and pipelined podcast turn generation on a mocked backend.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline --turns 8 --transcribe-ms 400 --encode-ms 150
+
+The mock Realtime server sends replies without transcripts, so every turn
+takes the Whisper fallback; the Whisper API is replaced by a stub that
+sleeps for --transcribe-ms, and encoding writes a WAV file plus a
+--encode-ms delay standing in for ffmpeg. The next host needs each
+reply's text, so with two voices the fallback runs in the generate stage
+and pipelining only overlaps post-processing and encoding.
+"""
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+from realtime_example.mock_realtime_server import MockRealtimeServer
+from realtime_example.episode_writer import EpisodeWriter
+from realtime_example.pipeline import StageTimings
+
+
+class FakeTranscriptions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, model, file):
+        time.sleep(self.latency)
+        return SimpleNamespace(text="A stubbed Whisper transcript.")
+
+
+async def render(podcast_generator, speakers, path, encode_delay, pipelined):
+    timings = StageTimings()
+    async with EpisodeWriter(path, pause_ms=500) as writer:
+        async def on_turn(index, turn):
+            await writer.append(turn["pcm"])
+            await asyncio.sleep(encode_delay)
+
+        await podcast_generator.generate_episode(
+            speakers, "Mock instructions.", on_turn=on_turn, keep_audio=False,
+            pipelined=pipelined, timings=timings,
+        )
+    return timings
+
+
+def report(label, timings):
+    summary = timings.summary()
+    print(f"{label}: {summary['wall_s']:.2f}s wall, {summary['busy_s']:.2f}s of stage work")
+    for name, stats in summary["stages"].items():
+        print(f"  {name:>11}: {stats['items']} items, mean {stats['mean_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+
+
+async def main(args):
+    server = MockRealtimeServer(
+        reply_seconds=args.reply_seconds,
+        chunk_ms=args.chunk_ms,
+        delta_interval=args.delta_interval,
+        transcript=None,
+    )
+    async with server:
+        from realtime_example import podcast_generator
+        podcast_generator.session_pool.url = server.url
+        podcast_generator.session_pool.headers = {}
+        podcast_generator.client = SimpleNamespace(
+            audio=SimpleNamespace(transcriptions=FakeTranscriptions(args.transcribe_ms / 1000))
+        )
+        podcast_generator.transcript_cache = None
+
+        speakers = ["alloy", "echo"] * (args.turns // 2) + ["alloy"] * (args.turns % 2)
+        with tempfile.TemporaryDirectory() as directory:
+            sequential = await render(
+                podcast_generator, speakers, os.path.join(directory, "sequential.wav"),
+                args.encode_ms / 1000, pipelined=False,
+            )
+            pipelined = await render(
+                podcast_generator, speakers, os.path.join(directory, "pipelined.wav"),
+                args.encode_ms / 1000, pipelined=True,
+            )
+        await podcast_generator.session_pool.close()
+
+    report("sequential", sequential)
+    report("pipelined", pipelined)
+    saved = sequential.wall - pipelined.wall
+    print(f"pipelining saved {saved:.2f}s ({saved / sequential.wall:.0%} of wall time)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--reply-seconds", type=float, default=5.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--delta-interval", type=float, default=0.01)
+    parser.add_argument("--transcribe-ms", type=float, default=400)
+    parser.add_argument("--encode-ms", type=float, default=150)
+    asyncio.run(main(parser.parse_args()))
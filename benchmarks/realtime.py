@@ -0,0 +1,250 @@
+"""Latency, bandwidth and CPU benchmarks for main.py and podcast_generator.py.
+
+Run from the repository root, against the deterministic mock server:
+
+    python -m benchmarks.realtime --turns 10 --json results.json
+    python -m benchmarks.realtime --recording session.json --jitter 0.005
+    python -m benchmarks.realtime --baseline results.json --tolerance 0.25
+
+The mock server runs on its own thread and event loop, and its CPU time is
+subtracted from the process's, so cpu_ms_per_audio_s covers only the
+client side. With --baseline, any metric that is worse than the baseline
+by more than --tolerance makes the run exit with status 1, for CI.
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+
+import numpy as np
+
+from realtime_example.mock_realtime_server import MockRealtimeServer
+from benchmarks.vad import synthetic_speech
+
+# Metrics where a higher value is a regression
+METRICS = (
+    "connect_ms", "first_delta_ms_p50", "first_delta_ms_p95", "turn_ms_p50", "turn_ms_p95",
+    "bytes_sent_per_turn", "bytes_received_per_turn", "cpu_ms_per_audio_s",
+)
+
+
+class FakeRequest:
+    def __init__(self, session_hash):
+        self.session_hash = session_hash
+
+
+class ServerThread:
+    """Runs a MockRealtimeServer on a separate thread and event loop."""
+
+    def __init__(self, **kwargs):
+        self.server = MockRealtimeServer(**kwargs)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+    def cpu_time(self):
+        async def thread_time():
+            return time.thread_time()
+        return asyncio.run_coroutine_threadsafe(thread_time(), self.loop).result()
+
+
+class Probe:
+    """Collects per-turn timings and the client CPU spent per audio second."""
+
+    def __init__(self, server_thread):
+        self.server_thread = server_thread
+        self.first_delta = []
+        self.turns = []
+        self.audio_seconds = 0.0
+
+    def __enter__(self):
+        self.server_thread.server.reset_stats()
+        self._cpu = time.process_time() - self.server_thread.cpu_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.cpu = time.process_time() - self.server_thread.cpu_time() - self._cpu
+
+    def results(self, connect_ms):
+        server = self.server_thread.server
+        turns = len(self.turns) or 1
+        first = np.percentile(np.asarray(self.first_delta) * 1000, [50, 95]) if self.first_delta else [0, 0]
+        total = np.percentile(np.asarray(self.turns) * 1000, [50, 95]) if self.turns else [0, 0]
+        return {
+            "turns": len(self.turns),
+            "connect_ms": round(connect_ms, 2),
+            "first_delta_ms_p50": round(first[0], 2),
+            "first_delta_ms_p95": round(first[1], 2),
+            "turn_ms_p50": round(total[0], 2),
+            "turn_ms_p95": round(total[1], 2),
+            "bytes_sent_per_turn": server.bytes_received // turns,
+            "bytes_received_per_turn": server.bytes_sent // turns,
+            "cpu_ms_per_audio_s": round(self.cpu * 1000 / self.audio_seconds, 2) if self.audio_seconds else None,
+        }
+
+
+async def bench_voice_chat(server_thread, turns, input_seconds):
+    from realtime_example import main as app
+    app.session_pool.url = server_thread.server.url
+    app.session_pool.headers = {}
+    # Measure transport, not playback pacing
+    app.PLAYBACK_LEAD_MS = 0
+    app.session_pool.warm_size = 0
+
+    rng = np.random.default_rng(0)
+    request = FakeRequest("benchmark")
+    history = []
+    with Probe(server_thread) as probe:
+        for _ in range(turns):
+            audio = (24000, synthetic_speech(input_seconds, rng))
+            started = time.perf_counter()
+            first = None
+            async for output, history in app.voice_chat_response(audio, history, request):
+                if output is None:
+                    continue
+                if first is None:
+                    first = time.perf_counter() - started
+                probe.audio_seconds += len(output[1]) / output[0]
+            probe.turns.append(time.perf_counter() - started)
+            if first is not None:
+                probe.first_delta.append(first)
+        await app.end_conversation(request)
+
+    stats = app.session_pool.stats()
+    await app.session_pool.close()
+    return probe.results(stats.get("handshake_ms_mean", 0.0))
+
+
+class FirstDeltaSocket:
+    """Wraps a websocket and timestamps the first audio delta it yields."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.started = time.perf_counter()
+        self.first_delta = None
+
+    async def __aiter__(self):
+        async for message in self.ws:
+            if self.first_delta is None and '"response.audio.delta"' in message:
+                self.first_delta = time.perf_counter() - self.started
+            yield message
+
+
+async def bench_podcast(server_thread, turns):
+    from realtime_example import podcast_generator
+    podcast_generator.session_pool.url = server_thread.server.url
+    podcast_generator.session_pool.headers = {}
+    podcast_generator.session_pool.warm_size = 0
+
+    get_audio_response = podcast_generator.get_audio_response
+    with Probe(server_thread) as probe:
+        async def timed_response(ws, *args, **kwargs):
+            socket = FirstDeltaSocket(ws)
+            reply = await get_audio_response(socket, *args, **kwargs)
+            probe.turns.append(time.perf_counter() - socket.started)
+            if socket.first_delta is not None:
+                probe.first_delta.append(socket.first_delta)
+            return reply
+
+        async def on_turn(index, turn):
+            probe.audio_seconds += len(turn["pcm"]) / 24000
+
+        podcast_generator.get_audio_response = timed_response
+        try:
+            await podcast_generator.generate_episode(
+                ["alloy", "echo"] * (turns // 2) + ["alloy"] * (turns % 2),
+                "Benchmark instructions.", on_turn=on_turn, keep_audio=False,
+            )
+        finally:
+            podcast_generator.get_audio_response = get_audio_response
+
+    stats = podcast_generator.session_pool.stats()
+    await podcast_generator.session_pool.close()
+    return probe.results(stats.get("handshake_ms_mean", 0.0))
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (target, metric, baseline, value) regressions."""
+    regressions = []
+    for target, metrics in results.items():
+        for metric in METRICS:
+            before, after = baseline.get(target, {}).get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > 1:
+                regressions.append((target, metric, before, after))
+    return regressions
+
+
+async def run(args):
+    server_thread = ServerThread(
+        reply_seconds=args.reply_seconds,
+        chunk_ms=args.chunk_ms,
+        delta_interval=args.delta_interval,
+        recording=args.recording,
+        time_scale=args.time_scale,
+        latency=args.latency,
+        jitter=args.jitter,
+        seed=args.seed,
+    ).start()
+    try:
+        results = {}
+        if args.target in ("all", "main"):
+            results["main"] = await bench_voice_chat(server_thread, args.turns, args.input_seconds)
+        if args.target in ("all", "podcast"):
+            results["podcast"] = await bench_podcast(server_thread, args.turns)
+    finally:
+        server_thread.stop()
+    return results
+
+
+def main(args):
+    results = asyncio.run(run(args))
+    for target, metrics in results.items():
+        print(f"{target}:")
+        for metric, value in metrics.items():
+            print(f"  {metric:>24}: {value}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for target, metric, before, after in regressions:
+            print(f"REGRESSION {target}.{metric}: {before} -> {after}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["all", "main", "podcast"], default="all")
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--input-seconds", type=int, default=3)
+    parser.add_argument("--reply-seconds", type=float, default=3.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--delta-interval", type=float, default=0.005)
+    parser.add_argument("--recording", help="replay responses recorded by mock_realtime_server.py --record")
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results written with --json")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    main(parser.parse_args())
@@ -0,0 +1,74 @@
+"""Measure source indexing and retrieval against embedding the whole document.
+
+Run from the repository root:
+
+    python -m benchmarks.source_retrieval --paragraphs 400 --turns 12
+
+The document is synthetic: each paragraph is drawn from the vocabulary of
+one of --topics topics, so retrieval precision can be checked by querying
+with a topic's words. Indexes are written to a temporary cache directory,
+and the second load shows what a batch run over the same corpus pays.
+Input text per response is estimated at 4 characters per token.
+"""
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from realtime_example import source_index
+from realtime_example.podcast_generator import CHUNKS_PER_TURN, CONTINUE_TEXT, build_instructions
+
+CHARS_PER_TOKEN = 4
+
+
+def synthetic_document(paragraphs, topics, rng):
+    common = [f"common{i}" for i in range(300)]
+    vocab = [[f"topic{t}word{i}" for i in range(60)] for t in range(topics)]
+    labels = rng.integers(0, topics, paragraphs)
+    text = []
+    for label in labels:
+        words = rng.choice(common, 90).tolist() + rng.choice(vocab[label], 30).tolist()
+        rng.shuffle(words)
+        text.append(" ".join(words) + ".")
+    return "\n\n".join(text), labels, vocab
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    text, labels, vocab = synthetic_document(args.paragraphs, args.topics, rng)
+    print(f"{len(text) / 1000:.0f}k characters, {args.paragraphs} paragraphs")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label in ("build", "cached load"):
+            source_index._loaded.clear()
+            started = time.perf_counter()
+            index = source_index.load_index(text, directory=cache_dir)
+            print(f"{label:>12}: {(time.perf_counter() - started) * 1000:7.1f} ms")
+
+    queries = [" ".join(rng.choice(vocab[t], 8)) for t in range(args.topics)]
+    started = time.perf_counter()
+    results = [index.search(query, CHUNKS_PER_TURN) for query in queries for _ in range(10)]
+    print(f"{'search':>12}: {(time.perf_counter() - started) * 1000 / len(results):7.3f} ms per query "
+          f"over {len(index)} chunks")
+
+    # Paragraphs are 120 words, so each chunk holds exactly one
+    correct = sum(labels[chunk] == t for t in range(args.topics) for chunk in results[t * 10])
+    print(f"{'precision':>12}: {correct / sum(len(results[t * 10]) for t in range(args.topics)):.2f}")
+
+    stuffed = len(build_instructions(text)) // CHARS_PER_TOKEN
+    # What prepare_source() sends for a document over PODCAST_SOURCE_MAX_CHARS
+    instructions = build_instructions(index.chunks[0])
+    cue = len(CONTINUE_TEXT) + CHUNKS_PER_TURN * np.mean([len(chunk) for chunk in index.chunks])
+    retrieved = [int(len(instructions) + cue * turn) // CHARS_PER_TOKEN for turn in range(1, args.turns + 1)]
+    print(f"input text tokens per response: whole document {stuffed}, "
+          f"retrieval {retrieved[0]} on turn 1 rising to {retrieved[-1]} by turn {args.turns} "
+          f"(before recap compaction)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=400)
+    parser.add_argument("--topics", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=12)
+    main(parser.parse_args())
@@ -0,0 +1,92 @@
+"""Measure import time and resident memory of the entry-point modules.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --rev HEAD~1
+
+Each import runs in a fresh interpreter, so nothing is shared between
+runs; the median wall time is reported along with peak RSS and which heavy
+libraries the import pulled in. With --rev, the same modules are also
+imported from that git revision, extracted to a temporary directory.
+"""
+import os
+import sys
+import json
+import tarfile
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+MODULES = ("main", "podcast_generator", "batch", "mock_realtime_server")
+HEAVY = ("gradio", "openai", "whisper", "torch", "pydub")
+
+PROBE = """
+import sys, time, json, resource
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(module, tree, runs):
+    # Revisions before the realtime_example package kept modules at the root
+    if os.path.isdir(os.path.join(tree, "realtime_example")):
+        module = f"realtime_example.{module}"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [tree, env.get("PYTHONPATH")]))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            cwd=tree, env=env, capture_output=True, text=True, timeout=300,
+        )
+        if out.returncode != 0:
+            return {"error": out.stderr.strip().splitlines()[-1]}
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "import_ms": round(statistics.median(r["seconds"] for r in results) * 1000, 1),
+        "rss_mb": round(statistics.median(r["rss_mb"] for r in results), 1),
+        "heavy": results[-1]["heavy"],
+    }
+
+
+def extract(rev, directory):
+    archive = subprocess.run(["git", "archive", rev], capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory)
+
+
+def report(label, tree, runs):
+    print(label)
+    for module in MODULES:
+        result = measure(module, tree, runs)
+        if "error" in result:
+            print(f"  {module:>22}: failed ({result['error']})")
+            continue
+        print(f"  {module:>22}: {result['import_ms']:8.1f} ms  {result['rss_mb']:7.1f} MB  "
+              f"loads {', '.join(result['heavy']) or 'nothing heavy'}")
+
+
+def main(args):
+    report("working tree", os.getcwd(), args.runs)
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tree:
+            extract(args.rev, tree)
+            report(args.rev, tree, args.runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rev", help="also measure this git revision")
+    main(parser.parse_args())
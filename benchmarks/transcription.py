@@ -0,0 +1,117 @@
+"""Compare transcription throughput of the Whisper API path and the local process pool.
+
+Run from the repository root:
+
+    python -m benchmarks.transcription --turns 32 --concurrency 8 --workers 2
+
+Both backends are mocked. The API client sleeps --api-ms per call. The
+local model burns --rtf seconds of CPU per second of audio and takes
+--load-ms to load, standing in for whisper.load_model(). The local
+backend is run warm and with batching, warm without batching, and with
+the model loaded on every call, as the old commented-out code would have.
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.vad import synthetic_speech
+from realtime_example.transcription import ApiTranscriber, LocalWhisperTranscriber, TRANSCRIBE_RATE
+
+
+class FakeWhisper:
+    def __init__(self, rtf):
+        self.rtf = rtf
+
+    def transcribe(self, samples, **kwargs):
+        end = time.process_time() + len(samples) / TRANSCRIBE_RATE * self.rtf
+        while time.process_time() < end:
+            pass
+        return {"text": " A mocked local transcript."}
+
+
+def load_fake_whisper(name):
+    """name is "<rtf>:<load_ms>"."""
+    rtf, load_ms = name.split(":")
+    time.sleep(int(load_ms) / 1000)
+    return FakeWhisper(float(rtf))
+
+
+class FakeTranscriptions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, model, file):
+        time.sleep(self.latency)
+        return SimpleNamespace(text="A mocked API transcript.")
+
+
+class ColdTranscriber:
+    """Loads the model on every call, in a worker thread."""
+
+    def __init__(self, model):
+        self.model = model
+
+    async def transcribe(self, pcm):
+        from realtime_example.transcription import whisper_input
+
+        def run():
+            return load_fake_whisper(self.model).transcribe(whisper_input(pcm))["text"]
+        return await asyncio.to_thread(run)
+
+
+async def drive(transcriber, clips, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(pcm):
+        async with semaphore:
+            started = time.perf_counter()
+            await transcriber.transcribe(pcm)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(pcm) for pcm in clips))
+    return time.perf_counter() - started, latencies
+
+
+async def main(args):
+    rng = np.random.default_rng(0)
+    clips = [synthetic_speech(args.seconds, rng).tobytes() for _ in range(args.turns)]
+    model = f"{args.rtf}:{args.load_ms}"
+    client = SimpleNamespace(audio=SimpleNamespace(transcriptions=FakeTranscriptions(args.api_ms / 1000)))
+
+    runs = [("api", ApiTranscriber(lambda: client))]
+    for label, batch_size in (("local, batched", args.batch), ("local, unbatched", 1)):
+        local = LocalWhisperTranscriber(model, args.workers, batch_size, args.batch_ms, loader=load_fake_whisper)
+        started = time.perf_counter()
+        await local.warm()
+        print(f"{label}: {args.workers} workers warmed in {time.perf_counter() - started:.2f}s")
+        runs.append((label, local))
+    runs.append(("local, load per call", ColdTranscriber(model)))
+
+    print(f"{args.turns} turns of {args.seconds}s audio, {args.concurrency} in flight")
+    for label, transcriber in runs:
+        elapsed, latencies = await drive(transcriber, clips, args.concurrency)
+        batches = f", {transcriber.batches} batches" if isinstance(transcriber, LocalWhisperTranscriber) else ""
+        print(f"{label:>21}: {args.turns / elapsed:6.2f} turns/s, "
+              f"p50 {statistics.median(latencies) * 1000:7.1f} ms{batches}")
+        if hasattr(transcriber, "close"):
+            transcriber.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=32)
+    parser.add_argument("--seconds", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=4)
+    parser.add_argument("--batch-ms", type=int, default=50)
+    parser.add_argument("--api-ms", type=int, default=800)
+    parser.add_argument("--rtf", type=float, default=0.02)
+    parser.add_argument("--load-ms", type=int, default=1500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""Measure how much faster than real time the VAD runs on one core.
+
+Run from the repository root:
+
+    python -m benchmarks.vad --seconds 60
+
+First it checks clips that are speech from start to end, where there is no
+silence to estimate a noise floor from: trim_silence must keep them whole
+and the Endpointer must still report the start and end of the utterance.
+It exits non-zero if any check fails.
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from realtime_example.audio_buffer import SAMPLE_RATE
+from realtime_example.vad import Endpointer, VADConfig, trim_silence
+
+
+def synthetic_speech(seconds, rng):
+    """Alternate 1-3 s tone bursts with 0.5-1.5 s of low-level noise."""
+    parts = []
+    total = 0
+    while total < seconds * SAMPLE_RATE:
+        gap = int(rng.uniform(0.5, 1.5) * SAMPLE_RATE)
+        burst = int(rng.uniform(1.0, 3.0) * SAMPLE_RATE)
+        t = np.arange(burst) / SAMPLE_RATE
+        parts.append((rng.standard_normal(gap) * 40).astype(np.int16))
+        parts.append((np.sin(2 * np.pi * rng.uniform(120, 300) * t) * 6000).astype(np.int16))
+        total += gap + burst
+    return np.concatenate(parts)[:seconds * SAMPLE_RATE]
+
+
+def tone(seconds, level, frequency=200.0, syllables_hz=0.0):
+    """A tone at roughly level dBFS RMS, optionally with a syllable-rate envelope."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    wave = np.sin(2 * np.pi * frequency * t) * np.sqrt(2) * 32768 * 10 ** (level / 20)
+    if syllables_hz:
+        wave *= 0.55 + 0.45 * np.sin(2 * np.pi * syllables_hz * t)
+    return wave.astype(np.int16)
+
+
+def stream_events(pcm, config, chunk):
+    endpointer = Endpointer(config)
+    events = []
+    for offset in range(0, len(pcm), chunk):
+        event = endpointer.push(pcm[offset:offset + chunk])
+        if event:
+            events.append(event)
+    return events
+
+
+def check_no_silence(config, chunk):
+    failures = 0
+    clips = [
+        ("steady, quiet", tone(2.0, config.threshold_db + 1)),
+        ("steady, loud", tone(2.0, -20)),
+        ("syllables", tone(2.7, -25, syllables_hz=4)),
+    ]
+    for label, pcm in clips:
+        kept = len(trim_silence(pcm, config)) / len(pcm)
+        trailing = np.zeros(SAMPLE_RATE * 2 * config.end_silence_ms // 1000, dtype=np.int16)
+        events = stream_events(np.concatenate((pcm, trailing)), config, chunk)
+        ok = kept > 0.99 and events == ["start", "end"]
+        failures += not ok
+        print(f"no silence, {label:>13}: trim kept {kept:.0%}, stream events {events} "
+              f"{'ok' if ok else 'FAILED'}")
+    return failures
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    chunk = SAMPLE_RATE * args.chunk_ms // 1000
+    failures = check_no_silence(VADConfig(), chunk)
+
+    pcm = synthetic_speech(args.seconds, rng)
+    config = VADConfig()
+
+    started = time.perf_counter()
+    trimmed = trim_silence(pcm, config)
+    trim_time = time.perf_counter() - started
+
+    endpointer = Endpointer(config)
+    events = 0
+    started = time.perf_counter()
+    for offset in range(0, len(pcm), chunk):
+        if endpointer.push(pcm[offset:offset + chunk]) == "end":
+            events += 1
+    stream_time = time.perf_counter() - started
+
+    print(f"{args.seconds}s of 24 kHz audio")
+    print(f"trim_silence: {trim_time * 1000:.2f} ms ({args.seconds / trim_time:.0f}x real time), "
+          f"kept {len(trimmed) / SAMPLE_RATE:.1f}s")
+    print(f"Endpointer ({args.chunk_ms} ms chunks): {stream_time * 1000:.2f} ms "
+          f"({args.seconds / stream_time:.0f}x real time), {events} utterances")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1 @@
+"""Voice chat and podcast generation with the OpenAI Realtime API."""
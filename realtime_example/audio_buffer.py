@@ -0,0 +1,158 @@
+import io
+import wave
+import binascii
+
+import numpy as np
+
+SAMPLE_RATE = 24000
+SAMPLE_WIDTH = 2
+
+
+def to_mono(audio_np):
+    """Average the channels of a (samples, channels) array.
+
+    Integer input is averaged in int64 and keeps its dtype, so int16 stays
+    on the int16 scale rather than being mistaken for float [-1, 1] audio.
+    """
+    if audio_np.ndim == 1:
+        return audio_np
+    if audio_np.shape[1] == 1:
+        return audio_np[:, 0]
+    if np.issubdtype(audio_np.dtype, np.integer):
+        return (audio_np.sum(axis=1, dtype=np.int64) // audio_np.shape[1]).astype(audio_np.dtype)
+    return audio_np.mean(axis=1, dtype=np.float32)
+
+
+def to_pcm16(audio_np):
+    """Convert float or integer samples to int16 without copying int16 input."""
+    if audio_np.dtype == np.int16:
+        return np.ascontiguousarray(audio_np)
+    if np.issubdtype(audio_np.dtype, np.floating):
+        scaled = np.clip(audio_np, -1.0, 1.0) * 32767.0
+        return scaled.astype(np.int16)
+    if audio_np.dtype == np.int32:
+        return (audio_np >> 16).astype(np.int16)
+    if audio_np.dtype == np.uint8:
+        return ((audio_np.astype(np.int16) - 128) << 8)
+    return audio_np.astype(np.int16)
+
+
+def decimate(audio_np, factor):
+    """Downsample by an integer factor, averaging each block of samples.
+
+    Strided slices are summed in a wider dtype, which is much faster than
+    reshape + mean and keeps int16 input in integer arithmetic.
+    """
+    usable = len(audio_np) - len(audio_np) % factor
+    wide = np.int32 if audio_np.dtype == np.int16 else np.float32
+    acc = audio_np[0:usable:factor].astype(wide)
+    for phase in range(1, factor):
+        acc += audio_np[phase:usable:factor]
+    if wide is np.int32:
+        return (acc // factor).astype(np.int16)
+    return acc / factor
+
+
+def resample(audio_np, sample_rate, target_rate=SAMPLE_RATE):
+    """Resample mono audio, averaging blocks for integer downsampling ratios."""
+    if sample_rate == target_rate or len(audio_np) == 0:
+        return audio_np
+    if sample_rate > target_rate and sample_rate % target_rate == 0:
+        return decimate(audio_np, sample_rate // target_rate)
+    duration = len(audio_np) / sample_rate
+    target_len = int(round(duration * target_rate))
+    positions = np.arange(target_len, dtype=np.float64) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(len(audio_np)), audio_np).astype(np.float32)
+
+
+def to_realtime_pcm16(audio_np, sample_rate):
+    """Convert a Gradio (rate, array) clip to 24 kHz mono PCM16."""
+    audio_np = to_mono(np.asarray(audio_np))
+    if sample_rate == SAMPLE_RATE:
+        return to_pcm16(audio_np)
+    if audio_np.dtype != np.int16:
+        if np.issubdtype(audio_np.dtype, np.floating):
+            audio_np = np.clip(audio_np, -1.0, 1.0) * 32767.0
+        else:
+            audio_np = to_pcm16(audio_np)
+    resampled = resample(audio_np, sample_rate)
+    if resampled.dtype == np.int16:
+        return resampled
+    return np.clip(resampled, -32768, 32767).astype(np.int16)
+
+
+def normalize_loudness(samples, target_dbfs=-18.0, max_gain_db=20.0):
+    """Scale PCM16 samples to a target RMS level in dBFS, clipping peaks.
+
+    Gain is capped at max_gain_db so near-silent audio is not blown up.
+    """
+    if len(samples) == 0:
+        return samples
+    floats = samples.astype(np.float32)
+    rms = float(np.sqrt(np.dot(floats, floats) / len(floats)))
+    if rms == 0.0:
+        return samples
+    gain_db = min(target_dbfs - 20.0 * np.log10(rms / 32768.0), max_gain_db)
+    floats *= 10.0 ** (gain_db / 20.0)
+    return np.clip(floats, -32768, 32767).astype(np.int16)
+
+
+def pcm16_to_wav(pcm, sample_rate=SAMPLE_RATE):
+    """Wrap mono PCM16 in an in-memory WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(memoryview(pcm).cast('B'))
+    return buffer.getvalue()
+
+
+def b64encode_pcm(pcm):
+    """Base64-encode PCM16 samples straight from their memory buffer."""
+    return binascii.b2a_base64(memoryview(pcm).cast('B'), newline=False).decode('ascii')
+
+
+class PCMBuffer:
+    """Growable PCM16 buffer that base64 deltas are decoded straight into.
+
+    Capacity doubles as needed, so a reply costs one decode per delta plus
+    an amortised constant number of copies rather than a join of all the
+    base64 text followed by a second full decode.
+    """
+
+    def __init__(self, capacity=SAMPLE_RATE * SAMPLE_WIDTH * 10):
+        self._data = bytearray(capacity)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > len(self._data):
+            grown = bytearray(max(needed, len(self._data) * 2))
+            # Assign through memoryviews: bytearray slice assignment would
+            # first copy the source, doubling the peak while growing
+            memoryview(grown)[:self.size] = memoryview(self._data)[:self.size]
+            self._data = grown
+
+    def append(self, pcm):
+        view = memoryview(pcm).cast('B')
+        self._reserve(len(view))
+        memoryview(self._data)[self.size:self.size + len(view)] = view
+        self.size += len(view)
+
+    def append_b64(self, delta):
+        self.append(binascii.a2b_base64(delta))
+
+    def view(self):
+        """Return a memoryview of the filled part of the buffer."""
+        return memoryview(self._data)[:self.size]
+
+    def samples(self):
+        """Return the filled part of the buffer as an int16 array (no copy)."""
+        return np.frombuffer(self._data, dtype=np.int16, count=self.size // SAMPLE_WIDTH)
+
+    def duration(self):
+        return self.size / (SAMPLE_RATE * SAMPLE_WIDTH)
@@ -0,0 +1,304 @@
+"""Render many podcast episodes concurrently from a manifest.
+
+Run from the repository root:
+
+    python -m realtime_example.batch manifest.json --output-dir episodes --concurrency 4
+
+The manifest is a JSON object with optional "defaults" and a list of
+"episodes"; each episode has an "id", either a "source" file (relative to
+the manifest) or inline "source_text", and optionally "speakers", "turns"
+and "start_text". Completed turns are checkpointed, so re-running the same
+manifest resumes interrupted episodes where they stopped. With
+--response-cache on, replies are cached by conversation prefix, so
+re-rendering an episode from scratch (e.g. after changing --format)
+makes no API calls; --response-cache replay fails any turn that is not
+cached instead of generating it.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from . import podcast_generator
+from .audio_buffer import SAMPLE_RATE, SAMPLE_WIDTH
+from .episode_writer import EpisodeWriter
+from .instrumentation import metrics
+from .pipeline import StageTimings
+from .response_cache import CACHE_MODE, CACHE_MODES, ResponseCache
+
+DEFAULT_SPEAKERS = ["alloy", "echo"]
+DEFAULT_TURNS = 4
+
+# Estimated USD per million tokens for gpt-4o-realtime-preview-2024-10-01
+PRICES_PER_MILLION = {
+    "input_text": 5.0,
+    "input_audio": 100.0,
+    "output_text": 20.0,
+    "output_audio": 200.0,
+}
+
+
+class RateLimiter:
+    """Token bucket limiting how many turns start per minute across episodes."""
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, per_minute / 60.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def load_manifest(path):
+    """Read a manifest and return fully resolved episode specs."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get("defaults", {})
+
+    episodes = []
+    for entry in manifest["episodes"]:
+        spec = {**defaults, **entry}
+        if "source_text" in spec:
+            source = spec["source_text"]
+        else:
+            with open(os.path.join(base_dir, spec["source"]), encoding="utf-8") as f:
+                source = f.read()
+        lineup = spec.get("speakers", DEFAULT_SPEAKERS)
+        turns = int(spec.get("turns", DEFAULT_TURNS))
+        episodes.append({
+            "id": str(spec["id"]),
+            "source_material": source,
+            "speakers": [lineup[i % len(lineup)] for i in range(turns)],
+            "start_text": spec.get("start_text", podcast_generator.START_TEXT),
+        })
+    return episodes
+
+
+def estimate_cost(usage):
+    inputs = usage.get("input_token_details", {})
+    outputs = usage.get("output_token_details", {})
+    tokens = {
+        "input_text": inputs.get("text_tokens", 0),
+        "input_audio": inputs.get("audio_tokens", 0),
+        "output_text": outputs.get("text_tokens", 0),
+        "output_audio": outputs.get("audio_tokens", 0),
+    }
+    return sum(tokens[key] * PRICES_PER_MILLION[key] / 1e6 for key in tokens)
+
+
+class EpisodeCheckpoint:
+    """Completed turns of one episode, stored as raw PCM plus a JSON index."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "checkpoint.json")
+        self.turns = []
+        self.usage = {}
+
+    def load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        self.turns = index["turns"]
+        self.usage.update(index.get("usage", {}))
+
+    def read_audio(self, turn):
+        with open(os.path.join(self.directory, turn["audio_file"]), "rb") as f:
+            return f.read()
+
+    def add_turn(self, speaker, transcript, pcm):
+        """Write one turn's audio, then record it in the index."""
+        pcm = memoryview(pcm).cast('B')
+        os.makedirs(self.directory, exist_ok=True)
+        audio_file = f"turn_{len(self.turns):03d}.pcm"
+        _write_atomic(os.path.join(self.directory, audio_file), pcm)
+        self.turns.append({
+            "speaker": speaker,
+            "transcript": transcript,
+            "audio_file": audio_file,
+            "audio_bytes": len(pcm),
+        })
+        data = json.dumps({"turns": self.turns, "usage": self.usage}, indent=2).encode("utf-8")
+        _write_atomic(self.index_path, data)
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+async def render_episode(spec, output_dir, rate_limiter, retries=3, backoff=2.0,
+                         pause_ms=1000, crossfade_ms=0, audio_format="mp3"):
+    """Generate, encode and report one episode, retrying from its checkpoint.
+
+    Each turn is checkpointed and appended to the encoder as soon as it
+    finishes, so the episode file is complete right after the last turn.
+    """
+    episode_dir = os.path.join(output_dir, spec["id"])
+    checkpoint = EpisodeCheckpoint(episode_dir)
+    started = time.perf_counter()
+    timings = StageTimings()
+    output_file = os.path.join(output_dir, f"{spec['id']}.{audio_format}")
+    writer = None
+    resumed_turns = 0
+    attempts = 0
+    error = None
+
+    # A bad checkpoint or an encoder that will not start fails this episode
+    # with a report, rather than the whole batch
+    try:
+        instructions, source = await asyncio.to_thread(podcast_generator.prepare_source, spec["source_material"])
+        checkpoint.load()
+        resumed_turns = len(checkpoint.turns)
+        os.makedirs(output_dir, exist_ok=True)
+        writer = await EpisodeWriter(output_file, pause_ms=pause_ms, crossfade_ms=crossfade_ms).open()
+        for turn in checkpoint.turns:
+            await writer.append(await asyncio.to_thread(checkpoint.read_audio, turn))
+    except Exception as e:
+        error = repr(e)
+        print(f"[{spec['id']}] could not start: {e}")
+    usage = checkpoint.usage
+
+    async def on_turn(index, turn):
+        await asyncio.to_thread(checkpoint.add_turn, turn["speaker"], turn["transcript"], turn["pcm"])
+        await writer.append(turn["pcm"])
+        print(f"[{spec['id']}] turn {index + 1}/{len(spec['speakers'])} done")
+
+    while error is None and len(checkpoint.turns) < len(spec["speakers"]):
+        attempts += 1
+        try:
+            await podcast_generator.generate_episode(
+                spec["speakers"],
+                instructions,
+                start_text=spec["start_text"],
+                completed_turns=list(checkpoint.turns),
+                on_turn=on_turn,
+                before_turn=rate_limiter.wait if rate_limiter else None,
+                usage=usage,
+                keep_audio=False,
+                timings=timings,
+                source=source,
+            )
+        except Exception as e:
+            if attempts > retries:
+                error = repr(e)
+                print(f"[{spec['id']}] giving up after {attempts} attempts: {e}")
+                break
+            delay = backoff * (2 ** (attempts - 1)) * (0.5 + random.random())
+            print(f"[{spec['id']}] attempt {attempts} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    if error is None:
+        try:
+            await writer.close()
+        except Exception as e:
+            error = repr(e)
+    if error is not None:
+        if writer is not None:
+            await writer.abort()
+        output_file = None
+
+    wall_seconds = time.perf_counter() - started
+    audio_bytes = sum(turn["audio_bytes"] for turn in checkpoint.turns)
+    audio_seconds = audio_bytes / (SAMPLE_RATE * SAMPLE_WIDTH)
+    report = {
+        "id": spec["id"],
+        "status": "failed" if error else "completed",
+        "error": error,
+        "turns": len(checkpoint.turns),
+        "resumed_turns": resumed_turns,
+        "attempts": attempts,
+        "wall_seconds": round(wall_seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "audio_seconds_per_wall_second": round(audio_seconds / wall_seconds, 3) if wall_seconds else None,
+        "usage": usage,
+        "estimated_cost_usd": round(estimate_cost(usage), 4),
+        "output_file": output_file,
+        "pipeline": timings.summary(),
+    }
+    os.makedirs(episode_dir, exist_ok=True)
+    _write_atomic(os.path.join(episode_dir, "report.json"), json.dumps(report, indent=2).encode("utf-8"))
+    return report
+
+
+async def run_batch(episodes, output_dir, concurrency=4, turns_per_minute=60, retries=3, **render_options):
+    """Render episodes with at most `concurrency` in flight at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = RateLimiter(turns_per_minute) if turns_per_minute else None
+    # Each episode holds one session per voice, usually two
+    podcast_generator.session_pool.warm_size = concurrency * 2
+
+    async def run(spec):
+        async with semaphore:
+            return await render_episode(spec, output_dir, rate_limiter, retries=retries, **render_options)
+
+    # Loads alongside the first turns rather than on the first fallback
+    warming = asyncio.create_task(podcast_generator.warm_transcriber())
+    try:
+        return await asyncio.gather(*(run(spec) for spec in episodes))
+    finally:
+        warming.cancel()
+        await podcast_generator.session_pool.close()
+        podcast_generator.close_transcriber()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("manifest")
+    parser.add_argument("--output-dir", default="episodes")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--turns-per-minute", type=float, default=60)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--format", choices=["mp3", "ogg", "wav"], default="mp3")
+    parser.add_argument("--pause-ms", type=int, default=1000)
+    parser.add_argument("--crossfade-ms", type=int, default=0)
+    parser.add_argument("--metrics-file", help="write Prometheus metrics for all turns to this file")
+    parser.add_argument("--response-cache", choices=CACHE_MODES, default=CACHE_MODE)
+    args = parser.parse_args()
+
+    if args.response_cache != "off":
+        podcast_generator.response_cache = ResponseCache(mode=args.response_cache)
+    else:
+        podcast_generator.response_cache = None
+    if args.response_cache != "replay":
+        podcast_generator.require_api_key()
+    episodes = load_manifest(args.manifest)
+    started = time.perf_counter()
+    reports = asyncio.run(run_batch(
+        episodes, args.output_dir, args.concurrency, args.turns_per_minute, args.retries,
+        pause_ms=args.pause_ms, crossfade_ms=args.crossfade_ms, audio_format=args.format,
+    ))
+    elapsed = time.perf_counter() - started
+
+    completed = [r for r in reports if r["status"] == "completed"]
+    audio = sum(r["audio_seconds"] for r in reports)
+    cost = sum(r["estimated_cost_usd"] for r in reports)
+    print(f"{len(completed)}/{len(reports)} episodes in {elapsed:.1f}s, "
+          f"{audio:.0f}s of audio, estimated ${cost:.2f}")
+    print(f"Turn metrics: {metrics.summary('podcast')}")
+    if podcast_generator.response_cache is not None:
+        print(f"Response cache: {podcast_generator.response_cache.stats()}")
+    if args.metrics_file:
+        metrics.write(args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a turn cannot even be queued."""
+
+
+class TurnLimiter:
+    """Limits in-flight turns per user and overall, with a bounded wait queue.
+
+    Turns beyond the limits wait on the shared event loop instead of tying
+    up a worker thread; once max_waiting turns are queued, new ones are
+    rejected with Overloaded so callers get backpressure instead of
+    unbounded latency.
+    """
+
+    def __init__(self, per_user=1, total=32, max_waiting=128):
+        self.per_user = per_user
+        self.total = total
+        self.max_waiting = max_waiting
+        self._total = asyncio.Semaphore(total)
+        self._users = {}
+        self._holders = {}
+        self.waiting = 0
+        self.active = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self, user_id):
+        if self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise Overloaded(f"{self.waiting} turns already waiting")
+
+        user = self._users.get(user_id)
+        if user is None:
+            user = self._users[user_id] = asyncio.Semaphore(self.per_user)
+        self._holders[user_id] = self._holders.get(user_id, 0) + 1
+
+        try:
+            self.waiting += 1
+            try:
+                await user.acquire()
+                try:
+                    await self._total.acquire()
+                except BaseException:
+                    user.release()
+                    raise
+            finally:
+                self.waiting -= 1
+
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+                self._total.release()
+                user.release()
+        finally:
+            self._holders[user_id] -= 1
+            if not self._holders[user_id]:
+                del self._holders[user_id]
+                del self._users[user_id]
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "users": len(self._users),
+        }
@@ -0,0 +1,89 @@
+import os
+import tempfile
+
+
+class DiskLRU:
+    """Size-capped directory of cache entries, evicted least recently used first.
+
+    An entry is one file per suffix, all named after its key. Files are
+    written in suffix order through a temporary file and an atomic rename,
+    and removed in reverse order, so an entry is complete whenever its last
+    file exists. The first file's mtime is the entry's last use: touch()
+    refreshes it, and once the directory holds more than max_bytes the
+    oldest entries are deleted.
+    """
+
+    def __init__(self, directory, max_bytes, suffixes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffixes = suffixes
+        self._size = None
+
+    def path(self, key, suffix=None):
+        return os.path.join(self.directory, f"{key}{suffix or self.suffixes[0]}")
+
+    def entries(self):
+        """Return (mtime, size, key) for every entry, including partial ones."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        first = self.suffixes[0]
+        entries = []
+        for name in names:
+            if not name.endswith(first):
+                continue
+            key = name[:-len(first)]
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            size = stat.st_size
+            for suffix in self.suffixes[1:]:
+                try:
+                    size += os.stat(self.path(key, suffix)).st_size
+                except FileNotFoundError:
+                    # A partial entry is still evicted, oldest first
+                    pass
+            entries.append((stat.st_mtime, size, key))
+        return entries
+
+    def touch(self, key):
+        os.utime(self.path(key))
+
+    def put(self, key, writers):
+        """Write an entry, then evict if the directory is over max_bytes.
+
+        writers maps each suffix to a function that writes that file's
+        content to an open binary file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        size = 0
+        for suffix in self.suffixes:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                writers[suffix](f)
+                size += f.tell()
+            os.replace(tmp, self.path(key, suffix))
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self.entries())
+        else:
+            self._size += size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until under max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            for suffix in reversed(self.suffixes):
+                try:
+                    os.remove(self.path(key, suffix))
+                except FileNotFoundError:
+                    pass
+            total -= size
+        self._size = total
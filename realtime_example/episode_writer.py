@@ -0,0 +1,132 @@
+import os
+import wave
+import asyncio
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE, SAMPLE_WIDTH
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+ENCODERS = {
+    ".mp3": ["-c:a", "libmp3lame", "-b:a", "128k"],
+    ".ogg": ["-c:a", "libopus", "-b:a", "48k"],
+    ".opus": ["-c:a", "libopus", "-b:a", "48k"],
+}
+
+
+class EpisodeWriter:
+    """Appends turns to an episode file as soon as they are ready.
+
+    PCM is piped straight into an ffmpeg encoder (MP3 or Opus, chosen by
+    file extension) or written to a WAV file, so memory stays flat however
+    long the episode gets and the file is finished moments after the last
+    turn. pause_ms of silence separates turns; crossfade_ms overlaps the end
+    of what has been written with the start of the next piece, as pydub's
+    append(crossfade=...) does.
+    """
+
+    def __init__(self, path, pause_ms=1000, crossfade_ms=0, sample_rate=SAMPLE_RATE):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.pause_samples = sample_rate * pause_ms // 1000
+        self.crossfade_samples = sample_rate * crossfade_ms // 1000
+        self.samples_written = 0
+        self.turns = 0
+        self._tail = np.zeros(0, dtype=np.int16)
+        self._process = None
+        self._wav = None
+
+    @property
+    def duration(self):
+        return (self.samples_written + len(self._tail)) / self.sample_rate
+
+    async def open(self):
+        extension = os.path.splitext(self.path)[1].lower()
+        if extension == ".wav":
+            self._wav = wave.open(self.path, "wb")
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(SAMPLE_WIDTH)
+            self._wav.setframerate(self.sample_rate)
+        elif extension in ENCODERS:
+            self._process = await asyncio.create_subprocess_exec(
+                FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+                "-f", "s16le", "-ar", str(self.sample_rate), "-ac", "1", "-i", "pipe:0",
+                *ENCODERS[extension], "-y", self.path,
+                stdin=asyncio.subprocess.PIPE,
+            )
+        else:
+            raise ValueError(f"Unsupported episode format: {extension}")
+        return self
+
+    async def _write(self, samples):
+        if len(samples) == 0:
+            return
+        self.samples_written += len(samples)
+        if self._wav is not None:
+            await asyncio.to_thread(self._wav.writeframes, samples.tobytes())
+        else:
+            self._process.stdin.write(samples.tobytes())
+            await self._process.stdin.drain()
+
+    async def append(self, pcm):
+        """Add one turn of 24 kHz mono PCM16 (bytes or an int16 array)."""
+        samples = np.frombuffer(pcm, dtype=np.int16) if not isinstance(pcm, np.ndarray) else pcm
+        if self.turns and self.pause_samples:
+            await self._append_piece(np.zeros(self.pause_samples, dtype=np.int16))
+        await self._append_piece(samples)
+        self.turns += 1
+
+    async def _append_piece(self, samples):
+        fade = min(len(self._tail), len(samples))
+        if fade:
+            split = len(self._tail) - fade
+            ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+            mixed = self._tail[split:] * (1.0 - ramp) + samples[:fade] * ramp
+            await self._write(self._tail[:split])
+            await self._write(np.clip(mixed, -32768, 32767).astype(np.int16))
+            samples = samples[fade:]
+        else:
+            await self._write(self._tail)
+
+        # Hold back the end of this piece so the next one can fade into it
+        keep = min(self.crossfade_samples, len(samples))
+        await self._write(samples[:len(samples) - keep])
+        self._tail = samples[len(samples) - keep:].copy()
+
+    async def close(self):
+        """Flush the last samples and wait for the encoder to finish."""
+        await self._write(self._tail)
+        self._tail = np.zeros(0, dtype=np.int16)
+        if self._wav is not None:
+            await asyncio.to_thread(self._wav.close)
+            self._wav = None
+        elif self._process is not None:
+            self._process.stdin.close()
+            returncode = await self._process.wait()
+            self._process = None
+            if returncode:
+                raise RuntimeError(f"{FFMPEG_BINARY} exited with status {returncode}")
+
+    async def abort(self):
+        """Stop writing and remove the partial file."""
+        if self._process is not None:
+            self._process.kill()
+            await self._process.wait()
+            self._process = None
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.close()
+        else:
+            await self.abort()
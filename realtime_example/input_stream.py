@@ -0,0 +1,89 @@
+import json
+
+from .audio_buffer import SAMPLE_RATE, SAMPLE_WIDTH, b64encode_pcm, to_realtime_pcm16
+
+DEFAULT_FRAME_MS = 100
+
+
+class InputAudioStream:
+    """Streams microphone audio upstream with input_audio_buffer.append.
+
+    Audio is converted to 24 kHz mono PCM16 and sent in fixed-size frames
+    while the user is still speaking, so by the time they stop only the
+    last partial frame and the commit are left to upload.
+    """
+
+    def __init__(self, session, frame_ms=DEFAULT_FRAME_MS, endpointer=None):
+        self.session = session
+        self.frame_bytes = SAMPLE_RATE * SAMPLE_WIDTH * frame_ms // 1000
+        self._pending = bytearray()
+        self.frames_sent = 0
+        self.bytes_sent = 0
+
+        # With an endpointer, nothing is sent until speech starts apart from
+        # a short pre-roll, so leading silence is never uploaded.
+        self.endpointer = endpointer
+        self.speaking = endpointer is None
+        if endpointer is not None:
+            self._preroll_bytes = SAMPLE_RATE * SAMPLE_WIDTH * endpointer.config.padding_ms // 1000
+
+    async def _configure(self):
+        # Server-side VAD would commit and answer on its own; turns are
+        # committed explicitly when the microphone stops.
+        if not self.session.manual_turns:
+            await self.session.send({
+                "type": "session.update",
+                "session": {"turn_detection": None},
+            })
+            self.session.manual_turns = True
+
+    async def _send_frame(self, frame):
+        await self.session.ws.send(json.dumps({
+            "type": "input_audio_buffer.append",
+            "audio": b64encode_pcm(frame),
+        }))
+        self.frames_sent += 1
+        self.bytes_sent += len(frame)
+
+    async def append(self, audio_np, sample_rate):
+        """Queue a microphone chunk and send every complete frame.
+
+        Returns the endpointer's "start"/"end" event for this chunk, if any.
+        """
+        pcm = to_realtime_pcm16(audio_np, sample_rate)
+        self._pending += memoryview(pcm).cast('B')
+
+        event = None
+        if self.endpointer is not None:
+            event = self.endpointer.push(pcm)
+            if not self.speaking:
+                if event is None and not self.endpointer.in_speech:
+                    if len(self._pending) > self._preroll_bytes:
+                        del self._pending[:len(self._pending) - self._preroll_bytes]
+                    return None
+                self.speaking = True
+
+        await self._configure()
+
+        view = memoryview(self._pending)
+        sent = 0
+        while len(view) - sent >= self.frame_bytes:
+            await self._send_frame(view[sent:sent + self.frame_bytes])
+            sent += self.frame_bytes
+        view.release()
+        if sent:
+            del self._pending[:sent]
+        return event
+
+    async def flush(self):
+        """Send whatever partial frame is left."""
+        if self._pending:
+            await self._send_frame(bytes(self._pending))
+            self._pending.clear()
+
+    def commit_event(self):
+        return json.dumps({"type": "input_audio_buffer.commit"})
+
+    @property
+    def duration(self):
+        return (self.bytes_sent + len(self._pending)) / (SAMPLE_RATE * SAMPLE_WIDTH)
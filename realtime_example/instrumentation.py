@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENABLED = os.getenv("REALTIME_METRICS", "1") == "1"
+METRICS_SAMPLE = float(os.getenv("REALTIME_METRICS_SAMPLE", "1.0"))
+TRACE_FILE = os.getenv("REALTIME_TRACE_FILE")
+
+PHASES = (
+    "connect", "send", "first_delta", "last_delta", "decode", "transcription", "postprocess", "encode", "total",
+)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Counters and per-phase latency histograms for Realtime turns.
+
+    Turns are sampled when they start: a sampled turn gets a TurnTrace that
+    records its phases, deltas and bytes; any other turn gets NULL_TRACE,
+    whose methods do nothing, so unsampled turns cost one random() call.
+    Sampled turns are also written to trace_file as JSONL spans.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, sample_rate=METRICS_SAMPLE, trace_file=TRACE_FILE):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.trace_file = trace_file
+        self.turns = {}
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._trace_out = None
+
+    def start_turn(self, app, **attributes):
+        if not self.enabled:
+            return NULL_TRACE
+        self.turns[app] = self.turns.get(app, 0) + 1
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return NULL_TRACE
+        return TurnTrace(self, app, attributes)
+
+    def observe(self, app, phase, seconds):
+        """Record a phase that is not part of any one turn, e.g. a connect."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._histogram(app, phase).observe(seconds)
+
+    def _histogram(self, app, phase):
+        key = (app, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def record(self, trace):
+        with self._lock:
+            for phase, seconds in trace.phases.items():
+                self._histogram(trace.app, phase).observe(seconds)
+            for name, value in (("audio_deltas", trace.deltas), ("audio_bytes", trace.audio_bytes),
+                                ("audio_base64_bytes", trace.base64_bytes), ("sampled_turns", 1)):
+                key = (trace.app, name)
+                self.counters[key] = self.counters.get(key, 0) + value
+            if self.trace_file:
+                self._write_span(trace)
+
+    def _write_span(self, trace):
+        if self._trace_out is None:
+            self._trace_out = open(self.trace_file, "a", encoding="utf-8", buffering=1)
+        self._trace_out.write(json.dumps(trace.span()) + "\n")
+
+    def summary(self, app):
+        """Mean milliseconds per phase and delta/byte totals for one app."""
+        with self._lock:
+            phases = {
+                phase: round(histogram.sum / histogram.count * 1000, 2)
+                for (name, phase), histogram in self.histograms.items()
+                if name == app and histogram.count
+            }
+            counters = {name: value for (owner, name), value in self.counters.items() if owner == app}
+        if counters.get("audio_bytes"):
+            counters["base64_overhead"] = round(counters["audio_base64_bytes"] / counters["audio_bytes"] - 1, 3)
+        return {"turns": self.turns.get(app, 0), "phase_ms_mean": phases, **counters}
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP realtime_turns_total Turns started.",
+            "# TYPE realtime_turns_total counter",
+        ]
+        lines += [f'realtime_turns_total{{app="{app}"}} {count}' for app, count in sorted(self.turns.items())]
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+            names = sorted({name for (_, name), _ in counters})
+            for name in names:
+                lines.append(f"# TYPE realtime_{name}_total counter")
+                lines += [
+                    f'realtime_{name}_total{{app="{app}"}} {value}'
+                    for (app, counter), value in counters if counter == name
+                ]
+
+            lines += [
+                "# HELP realtime_turn_phase_seconds Time spent in each phase of a turn.",
+                "# TYPE realtime_turn_phase_seconds histogram",
+            ]
+            for (app, phase), histogram in histograms:
+                labels = f'app="{app}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'realtime_turn_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'realtime_turn_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"realtime_turn_phase_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"realtime_turn_phase_seconds_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the exposition text atomically, e.g. for a textfile collector."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port, host="0.0.0.0"):
+        """Serve /metrics from a background thread and return the server."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class TurnTrace:
+    """Phase timings and byte counts for one sampled turn.
+
+    Phases are accumulated durations in seconds from perf_counter:
+    connect and send cover acquiring the session and sending the request,
+    first_delta and last_delta are measured from when the response was
+    requested, and decode, transcription, postprocess and encode add up
+    the time spent in each.
+    """
+
+    def __init__(self, metrics, app, attributes):
+        self.metrics = metrics
+        self.app = app
+        self.attributes = attributes
+        self.wall_start = time.time()
+        self.started = time.perf_counter()
+        self.requested = None
+        self.phases = {}
+        self.deltas = 0
+        self.audio_bytes = 0
+        self.base64_bytes = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def since(self, phase, start):
+        """Add the time from start (a perf_counter value) until now to phase."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - start
+        return now
+
+    def requested_response(self):
+        self.requested = time.perf_counter()
+
+    def audio_delta(self, base64_bytes, audio_bytes, decode_seconds=0.0):
+        now = time.perf_counter()
+        since = now - (self.requested or self.started)
+        if not self.deltas:
+            self.phases["first_delta"] = since
+        self.phases["last_delta"] = since
+        self.deltas += 1
+        self.base64_bytes += base64_bytes
+        self.audio_bytes += audio_bytes
+        if decode_seconds:
+            self.phases["decode"] = self.phases.get("decode", 0.0) + decode_seconds
+
+    def finish(self, **attributes):
+        self.phases["total"] = time.perf_counter() - self.started
+        self.attributes.update(attributes)
+        self.metrics.record(self)
+
+    def span(self):
+        return {
+            "name": "turn",
+            "app": self.app,
+            "start": round(self.wall_start, 6),
+            "duration_ms": round(self.phases.get("total", 0.0) * 1000, 3),
+            "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            "deltas": self.deltas,
+            "audio_bytes": self.audio_bytes,
+            "base64_bytes": self.base64_bytes,
+            "attributes": self.attributes,
+        }
+
+
+class NullTrace:
+    """Stands in for TurnTrace when a turn is not sampled."""
+
+    def add(self, phase, seconds):
+        pass
+
+    def since(self, phase, start):
+        return start
+
+    def requested_response(self):
+        pass
+
+    def audio_delta(self, base64_bytes, audio_bytes, decode_seconds=0.0):
+        pass
+
+    def finish(self, **attributes):
+        pass
+
+
+NULL_TRACE = NullTrace()
+
+# Process-wide registry used by main.py, podcast_generator.py and batch.py
+metrics = Metrics()
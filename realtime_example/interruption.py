@@ -0,0 +1,81 @@
+import json
+import time
+import asyncio
+
+from .audio_buffer import SAMPLE_RATE
+
+
+class ActiveReply:
+    """Playback state of the reply currently streaming to one conversation.
+
+    The reply's audio is handed to the browser no more than lead_ms ahead
+    of real time, so the amount already played can be estimated from the
+    wall clock and an interruption stops audio within about lead_ms. On
+    interrupt() the response is cancelled and the assistant item truncated
+    to what was actually heard, keeping the server's conversation in step
+    with the user's.
+    """
+
+    def __init__(self, lead_ms=500, sample_rate=SAMPLE_RATE):
+        self.lead = lead_ms / 1000
+        self.sample_rate = sample_rate
+        self.ws = None
+        self.item_id = None
+        self.samples_sent = 0
+        self.first_sent = None
+        self.interrupted = asyncio.Event()
+        self.interrupted_at = None
+        self.finished = False
+        self.audio_end_ms = None
+        self.buffered_ms = None
+
+    @property
+    def sent_ms(self):
+        return self.samples_sent * 1000 // self.sample_rate
+
+    def played_ms(self, now=None):
+        if self.first_sent is None:
+            return 0
+        elapsed = ((now or time.perf_counter()) - self.first_sent) * 1000
+        return int(min(self.sent_ms, elapsed))
+
+    async def pace(self):
+        """Wait until the next chunk is due; returns False if interrupted meanwhile."""
+        if self.interrupted.is_set():
+            return False
+        if self.first_sent is None or not self.lead:
+            return True
+        ahead = self.samples_sent / self.sample_rate - (time.perf_counter() - self.first_sent)
+        if ahead > self.lead:
+            try:
+                await asyncio.wait_for(self.interrupted.wait(), ahead - self.lead)
+                return False
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    def sent(self, samples):
+        if self.first_sent is None:
+            self.first_sent = time.perf_counter()
+        self.samples_sent += samples
+
+    async def interrupt(self):
+        """Cancel the response and truncate its item to the audio already played."""
+        if self.interrupted.is_set() or self.finished:
+            return False
+        now = time.perf_counter()
+        self.interrupted_at = now
+        self.interrupted.set()
+        self.audio_end_ms = self.played_ms(now)
+        self.buffered_ms = self.sent_ms - self.audio_end_ms
+
+        if self.ws is not None:
+            await self.ws.send(json.dumps({"type": "response.cancel"}))
+            if self.item_id is not None:
+                await self.ws.send(json.dumps({
+                    "type": "conversation.item.truncate",
+                    "item_id": self.item_id,
+                    "content_index": 0,
+                    "audio_end_ms": self.audio_end_ms,
+                }))
+        return True
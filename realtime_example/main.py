@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import asyncio
+from collections import deque
+import numpy as np
+from dotenv import load_dotenv
+
+from .audio_buffer import SAMPLE_RATE, PCMBuffer, b64encode_pcm, to_realtime_pcm16
+from .concurrency import Overloaded, TurnLimiter
+from .input_stream import InputAudioStream
+from .instrumentation import metrics
+from .interruption import ActiveReply
+from .realtime_events import STOP, EventDispatcher
+from .realtime_session import RealtimeSessionPool
+from .vad import Endpointer, VADConfig, trim_silence
+
+load_dotenv()
+
+# Stream reply audio to the browser as it is generated
+STREAM_AUDIO = os.getenv("REALTIME_STREAM_AUDIO", "1") == "1"
+STREAM_CHUNK_MS = int(os.getenv("REALTIME_STREAM_CHUNK_MS", "200"))
+
+# Send microphone audio while the user speaks instead of after they stop
+STREAM_INPUT = os.getenv("REALTIME_STREAM_INPUT", "0") == "1"
+INPUT_FRAME_MS = int(os.getenv("REALTIME_INPUT_FRAME_MS", "100"))
+
+# Local voice activity detection trims silence and detects end of speech
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+vad_config = VADConfig(
+    threshold_db=float(os.getenv("VAD_THRESHOLD_DB", "-45")),
+    end_silence_ms=int(os.getenv("VAD_END_SILENCE_MS", "700")),
+)
+
+# Uncommitted microphone input, keyed by browser session
+input_streams = {}
+
+# New speech cancels the reply that is playing and truncates it to what was
+# heard; replies are paced to stay at most PLAYBACK_LEAD_MS ahead of playback
+BARGE_IN = os.getenv("REALTIME_BARGE_IN", "1") == "1"
+PLAYBACK_LEAD_MS = int(os.getenv("REALTIME_PLAYBACK_LEAD_MS", "500"))
+
+# Reply currently playing, keyed by browser session
+active_replies = {}
+
+# Seconds of reply audio still heard after a barge-in
+barge_in_latency = deque(maxlen=1000)
+
+# Seconds from submitting a turn until its first audio chunk is yielded
+time_to_first_audio = deque(maxlen=1000)
+
+# One long-lived Realtime session per browser session, plus a few warm
+# connections so a new conversation does not pay for the handshake.
+session_pool = RealtimeSessionPool(
+    warm_size=int(os.getenv("REALTIME_WARM_SESSIONS", "2")),
+    max_sessions=int(os.getenv("REALTIME_MAX_SESSIONS", "64")),
+    idle_timeout=float(os.getenv("REALTIME_IDLE_TIMEOUT", "300")),
+)
+
+# Seconds to wait for the next server event before a turn is abandoned and
+# its session discarded, so a wedged session cannot hold the turn slot
+TURN_TIMEOUT = float(os.getenv("REALTIME_TURN_TIMEOUT", "30"))
+
+# Errors that arrive after the fact, e.g. cancelling a reply that had
+# already finished, and do not affect the turn in progress
+IGNORED_ERRORS = {"response_cancel_not_active"}
+
+class TurnFailed(RuntimeError):
+    """Raised when the server reports an error during a turn."""
+
+# Serve Prometheus metrics for Realtime turns on this port, if set
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Handlers run on Gradio's event loop; the limiter keeps one user from
+# hogging it and rejects new turns once the wait queue is full.
+MAX_CONCURRENT_TURNS = int(os.getenv("MAX_CONCURRENT_TURNS", "32"))
+turn_limiter = TurnLimiter(
+    per_user=int(os.getenv("MAX_TURNS_PER_USER", "1")),
+    total=MAX_CONCURRENT_TURNS,
+    max_waiting=int(os.getenv("MAX_QUEUED_TURNS", "128")),
+)
+
+async def stream_openai_audio(audio_event, conversation_id=None, reply=None, audio=None):
+    """Yield the model's PCM16 audio as each delta arrives.
+
+    Deltas are decoded into audio, a PCMBuffer (a new one per turn if not
+    given), and each is yielded as a memoryview of its part of the buffer.
+
+    With an ActiveReply, audio stops being yielded once it is interrupted,
+    while the loop keeps reading until the cancelled response is done.
+    A server error ends the turn with TurnFailed; a server that goes
+    quiet for TURN_TIMEOUT raises TimeoutError and the session is dropped.
+    """
+    started = time.perf_counter()
+    trace = metrics.start_turn("main", conversation_id=conversation_id)
+    if audio is None:
+        audio = PCMBuffer()
+    error = None
+    try:
+        async with session_pool.session(conversation_id) as session:
+            ws = session.ws
+            mark = trace.since("connect", started)
+            if reply is not None:
+                reply.ws = ws
+
+            # Send audio event to the server
+            await ws.send(audio_event)
+            trace.since("send", mark)
+
+            events = EventDispatcher()
+            requested = False
+
+            @events.on('conversation.item.created')
+            async def request_response(event):
+                nonlocal requested
+                if requested:
+                    return
+                requested = True
+
+                # Send a command to create a response
+                response_message = {
+                    "type": "response.create"
+                }
+                mark = time.perf_counter()
+                await ws.send(json.dumps(response_message))
+                trace.since("send", mark)
+                trace.requested_response()
+
+            @events.on('response.audio.delta')
+            def decode_delta(event):
+                if reply is not None:
+                    reply.item_id = event.item_id or reply.item_id
+                    if reply.interrupted.is_set():
+                        return None
+                mark = time.perf_counter()
+                start = len(audio)
+                audio.append_b64(event.delta)
+                trace.audio_delta(len(event.delta), len(audio) - start, time.perf_counter() - mark)
+                # Growing the buffer swaps in a new bytearray, so the view
+                # stays valid after later deltas
+                return audio.view()[start:]
+
+            # Wait for the response to finish so the session is idle
+            # before it is handed to the next turn
+            @events.on('response.done')
+            def response_done(event):
+                if not requested:
+                    return None
+                if reply is not None:
+                    reply.finished = True
+                    if reply.interrupted_at is not None:
+                        metrics.observe("main", "barge_in_cancel", time.perf_counter() - reply.interrupted_at)
+                return STOP
+
+            @events.on('error')
+            def on_error(event):
+                nonlocal error
+                details = event.get('error') or {}
+                if details.get('code') in IGNORED_ERRORS:
+                    print(f"Ignoring server error: {details.get('message')}")
+                    return None
+                error = details
+                return STOP
+
+            while True:
+                # Raising inside the session block discards the session
+                message = await asyncio.wait_for(ws.recv(), TURN_TIMEOUT)
+                pcm = await events.dispatch(message)
+                if pcm is STOP:
+                    break
+                # Hand each audio chunk to the caller straight away
+                if pcm is not None:
+                    yield pcm
+        # Raised after the session is released, as it is idle again
+        if error is not None:
+            raise TurnFailed(f"Server error: {error.get('message', error)}")
+    finally:
+        trace.finish()
+
+async def connect_to_openai_websocket(audio_event, conversation_id=None, reply=None):
+    audio_data = PCMBuffer()
+    async for _ in stream_openai_audio(audio_event, conversation_id, reply, audio_data):
+        pass
+    return bytes(audio_data.view()) if audio_data else None
+
+def audio_to_item_create_event(audio_data: tuple) -> str:
+    sample_rate, audio_np = audio_data
+
+    # The Realtime API expects raw 24 kHz mono PCM16, no WAV header
+    pcm = to_realtime_pcm16(audio_np, sample_rate)
+
+    # Silence is billed like speech, so only send the voiced part
+    if VAD_ENABLED:
+        pcm = trim_silence(pcm, vad_config)
+        if len(pcm) == 0:
+            return None
+
+    pcm_base64 = b64encode_pcm(pcm)
+    
+    event = {
+        "type": "conversation.item.create",
+        "item": {
+            "type": "message",
+            "role": "user",
+            "content": [{
+                "type": "input_audio",
+                "audio": pcm_base64
+            }]
+        }
+    }
+    return json.dumps(event)
+
+async def interrupt_reply(conversation_id):
+    """Barge in on the conversation's playing reply, if there is one."""
+    reply = active_replies.get(conversation_id)
+    if reply is None:
+        return False
+    try:
+        if not await reply.interrupt():
+            return False
+    except Exception as e:
+        print(f"Error cancelling reply: {e}")
+        return False
+    barge_in_latency.append(reply.buffered_ms / 1000)
+    metrics.observe("main", "barge_in_stop", reply.buffered_ms / 1000)
+    print(f"Barge-in: reply cut at {reply.audio_end_ms} ms, {reply.buffered_ms} ms already buffered")
+    return True
+
+async def voice_chat_response(audio_data, history, request: gr.Request):
+    started = time.perf_counter()
+    audio_event = audio_to_item_create_event(audio_data)
+    if audio_event is None:
+        print("No speech detected.")
+        yield None, history
+        return
+    # Only speech barges in; a clip of silence leaves the reply playing
+    if BARGE_IN:
+        await interrupt_reply(request.session_hash)
+    async for output in limited_turn(audio_event, history, request.session_hash, started):
+        yield output
+
+async def stream_microphone(audio_chunk, turn_count, request: gr.Request):
+    """Send microphone audio upstream while the user is still speaking.
+
+    Bumps turn_count when the endpointer hears the end of an utterance,
+    which triggers the reply without waiting for the user to stop recording.
+    """
+    if audio_chunk is None:
+        return turn_count
+    stream = input_streams.get(request.session_hash)
+    if stream is None or stream.session.closed:
+        session = await session_pool.acquire(request.session_hash)
+        endpointer = Endpointer(vad_config) if VAD_ENABLED else None
+        stream = input_streams[request.session_hash] = InputAudioStream(session, INPUT_FRAME_MS, endpointer)
+    sample_rate, audio_np = audio_chunk
+    event = await stream.append(audio_np, sample_rate)
+    if event == "start" and BARGE_IN:
+        await interrupt_reply(request.session_hash)
+    elif event == "end":
+        return turn_count + 1
+    return turn_count
+
+async def finish_streamed_turn(history, request: gr.Request):
+    """Commit the streamed input buffer and play the reply."""
+    started = time.perf_counter()
+    stream = input_streams.pop(request.session_hash, None)
+    if stream is None or not stream.speaking:
+        # Already answered on end-of-utterance, or nothing but silence
+        yield load_gradio().skip(), history
+        return
+    await stream.flush()
+    print(f"Streamed {stream.duration:.2f}s of input in {stream.frames_sent} frames.")
+    async for output in limited_turn(stream.commit_event(), history, request.session_hash, started):
+        yield output
+
+async def limited_turn(audio_event, history, conversation_id, started):
+    try:
+        async with turn_limiter.slot(conversation_id):
+            async for output in voice_chat_turn(audio_event, history, conversation_id, started):
+                yield output
+    except Overloaded:
+        raise load_gradio().Error("The server is busy, please try again in a moment.")
+    except (TurnFailed, asyncio.TimeoutError) as e:
+        print(f"Turn failed: {e!r}")
+        raise load_gradio().Error("The reply failed, please try again.")
+
+async def voice_chat_turn(audio_event, history, conversation_id, started):
+    reply = ActiveReply(PLAYBACK_LEAD_MS if BARGE_IN else 0)
+    if BARGE_IN:
+        active_replies[conversation_id] = reply
+    try:
+        async for output in play_reply(audio_event, history, conversation_id, started, reply):
+            yield output
+    finally:
+        if active_replies.get(conversation_id) is reply:
+            del active_replies[conversation_id]
+
+async def play_reply(audio_event, history, conversation_id, started, reply):
+    if not STREAM_AUDIO:
+        audio_response = await connect_to_openai_websocket(audio_event, conversation_id, reply)
+        if isinstance(audio_response, bytes) and not reply.interrupted.is_set():
+            yield (SAMPLE_RATE, np.frombuffer(audio_response, dtype=np.int16)), history
+        else:
+            yield None, history
+        return
+
+    # The first delta goes out immediately; later ones are batched so the
+    # browser is not flooded with tiny chunks.
+    min_chunk_bytes = SAMPLE_RATE * 2 * STREAM_CHUNK_MS // 1000
+    pending = bytearray()
+    first_chunk = True
+
+    async for pcm in stream_openai_audio(audio_event, conversation_id, reply):
+        pending += pcm
+        if first_chunk or len(pending) >= min_chunk_bytes:
+            if not await reply.pace():
+                pending = bytearray()
+                continue
+            if first_chunk:
+                time_to_first_audio.append(time.perf_counter() - started)
+                print(f"Time to first audio: {time_to_first_audio[-1] * 1000:.0f} ms")
+                first_chunk = False
+            reply.sent(len(pending) // 2)
+            yield (SAMPLE_RATE, np.frombuffer(pending, dtype=np.int16)), history
+            pending = bytearray()
+
+    if pending and not reply.interrupted.is_set():
+        reply.sent(len(pending) // 2)
+        yield (SAMPLE_RATE, np.frombuffer(pending, dtype=np.int16)), history
+
+async def end_conversation(request: gr.Request):
+    input_streams.pop(request.session_hash, None)
+    await session_pool.close_conversation(request.session_hash)
+
+def load_gradio():
+    """Import Gradio on first use, so the turn logic imports without it.
+
+    It is bound as the module-level gr because the request: gr.Request
+    annotations are resolved by Gradio when a handler runs.
+    """
+    global gr
+    import gradio as gr
+    return gr
+
+def build_demo():
+    """Build the Gradio interface."""
+    gr = load_gradio()
+    with gr.Blocks(title="OpenAI Realtime API") as demo:
+        gr.Markdown("<h1 style='text-align: center;'>OpenAI Realtime API</h1>")
+
+        with gr.Tab("VoiceChat"):
+            gr.Markdown("Speak to interact with the OpenAI model in real-time and hear its responses.")
+
+            audio_input = gr.Audio(
+                label="Record your voice",
+                sources="microphone",
+                type="numpy",
+                streaming=STREAM_INPUT,
+                render=True
+            )
+
+            audio_output = gr.Audio(
+                autoplay=True,
+                streaming=STREAM_AUDIO,
+                render=True
+            )
+
+            history_state = gr.State([])
+            turn_count = gr.State(0)
+
+            if STREAM_INPUT:
+                audio_input.stream(
+                    fn=stream_microphone,
+                    inputs=[audio_input, turn_count],
+                    outputs=[turn_count],
+                    stream_every=INPUT_FRAME_MS / 1000,
+                    concurrency_limit=None
+                )
+                turn_count.change(
+                    fn=finish_streamed_turn,
+                    inputs=[history_state],
+                    outputs=[audio_output, history_state]
+                )
+                audio_input.stop_recording(
+                    fn=finish_streamed_turn,
+                    inputs=[history_state],
+                    outputs=[audio_output, history_state]
+                )
+            else:
+                # Each recording is its own event, and "multiple" lets a new
+                # one start while the previous reply is still playing, so it
+                # can barge in on it
+                audio_input.stop_recording(
+                    fn=voice_chat_response,
+                    inputs=[audio_input, history_state],
+                    outputs=[audio_output, history_state],
+                    trigger_mode="multiple"
+                )
+
+        demo.unload(end_conversation)
+
+    demo.queue(
+        default_concurrency_limit=MAX_CONCURRENT_TURNS,
+        max_size=turn_limiter.max_waiting,
+    )
+    return demo
+
+def main():
+    """Serve the voice chat UI."""
+    if METRICS_PORT:
+        metrics.serve(METRICS_PORT)
+    build_demo().launch()
+
+if __name__ == "__main__":
+    main()
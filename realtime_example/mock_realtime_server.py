@@ -0,0 +1,523 @@
+import json
+import math
+import time
+import array
+import base64
+import random
+import asyncio
+import argparse
+import itertools
+
+import websockets
+
+SAMPLE_RATE = 24000
+
+# Rough token estimates used to fill in response.done usage
+CHARS_PER_TOKEN = 4
+AUDIO_TOKENS_PER_SECOND = 10
+
+# Lifecycle events the server generates itself instead of replaying
+GENERATED_EVENTS = {'response.created', 'response.done'}
+
+
+def sine_pcm16(duration_s, frequency=440.0, sample_rate=SAMPLE_RATE):
+    """Generate a PCM16 mono sine tone to stand in for model audio."""
+    count = int(duration_s * sample_rate)
+    step = 2 * math.pi * frequency / sample_rate
+    samples = array.array('h', (int(8000 * math.sin(i * step)) for i in range(count)))
+    return samples.tobytes()
+
+
+def estimate_tokens(item):
+    """Estimate (text_tokens, audio_tokens) for a conversation item."""
+    text_tokens = audio_tokens = 0
+    for part in item.get('content', []):
+        if part.get('text'):
+            text_tokens += len(part['text']) // CHARS_PER_TOKEN + 1
+        if part.get('audio'):
+            seconds = len(part['audio']) * 3 / 4 / (SAMPLE_RATE * 2)
+            audio_tokens += int(seconds * AUDIO_TOKENS_PER_SECOND) + 1
+    return text_tokens, audio_tokens
+
+
+def synthetic_response(reply_seconds=1.0, chunk_ms=100, delta_interval=0.0,
+                       transcript="This is a mock reply from the local Realtime server."):
+    """Build the timeline of a sine-tone reply as (seconds, event) pairs."""
+    pcm = sine_pcm16(reply_seconds)
+    chunk_bytes = int(SAMPLE_RATE * chunk_ms / 1000) * 2
+    words = transcript.split(" ") if transcript else []
+
+    timeline = []
+    for index, offset in enumerate(range(0, len(pcm), chunk_bytes)):
+        t = index * delta_interval
+        if index < len(words):
+            timeline.append((t, {
+                "type": "response.audio_transcript.delta",
+                "delta": words[index] if index == 0 else " " + words[index],
+            }))
+        timeline.append((t, {
+            "type": "response.audio.delta",
+            "delta": base64.b64encode(pcm[offset:offset + chunk_bytes]).decode('ascii'),
+        }))
+    end = len(timeline) and timeline[-1][0]
+    timeline.append((end, {"type": "response.audio.done"}))
+    if transcript:
+        timeline.append((end, {"type": "response.audio_transcript.done", "transcript": transcript}))
+    return timeline
+
+
+def rechunk_audio(timeline, chunk_ms):
+    """Re-split a timeline's audio deltas into chunk_ms pieces.
+
+    The new deltas are spread evenly between the first and last original
+    delta, so the overall pacing of the reply is kept.
+    """
+    deltas = [(t, event) for t, event in timeline if event['type'] == 'response.audio.delta']
+    if not deltas or not chunk_ms:
+        return timeline
+    pcm = b''.join(base64.b64decode(event['delta']) for _, event in deltas)
+    chunk_bytes = max(2, int(SAMPLE_RATE * chunk_ms / 1000) * 2)
+    count = math.ceil(len(pcm) / chunk_bytes)
+    start, end = deltas[0][0], deltas[-1][0]
+    template = deltas[0][1]
+
+    chunks = []
+    for index in range(count):
+        t = start + (end - start) * index / max(1, count - 1)
+        piece = pcm[index * chunk_bytes:(index + 1) * chunk_bytes]
+        chunks.append((t, {**template, "delta": base64.b64encode(piece).decode('ascii')}))
+    others = [(t, event) for t, event in timeline if event['type'] != 'response.audio.delta']
+    # Stable sort with the chunks first, so events sharing a timestamp with
+    # the last delta (e.g. response.audio.done) still follow it
+    return sorted(chunks + others, key=lambda pair: pair[0])
+
+
+def audio_seconds(timeline):
+    audio_bytes = sum(
+        len(event['delta']) * 3 // 4
+        for _, event in timeline if event['type'] == 'response.audio.delta'
+    )
+    return audio_bytes / (SAMPLE_RATE * 2)
+
+
+def timeline_transcript(timeline):
+    for _, event in timeline:
+        if event['type'] == 'response.audio_transcript.done':
+            return event.get('transcript')
+    return None
+
+
+def load_recording(path):
+    """Read recorded responses written by RecordingProxy as timelines."""
+    with open(path, encoding="utf-8") as f:
+        recording = json.load(f)
+    return [
+        [(step["t"], step["event"]) for step in response if step["event"].get('type') not in GENERATED_EVENTS]
+        for response in recording["responses"]
+    ]
+
+
+class MockConversation:
+    """Per-connection conversation state, used to report token usage."""
+
+    def __init__(self):
+        self.items = {}
+        self.instructions_tokens = 0
+        self.pending_audio_bytes = 0
+        self.responses = 0
+        self.response_task = None
+        # The voice is fixed once the conversation holds assistant audio
+        self.voice = "alloy"
+        self.has_audio = False
+
+    def voice_error(self, voice):
+        """Return an error event if switching to voice is not allowed."""
+        if not voice or voice == self.voice:
+            return None
+        if not self.has_audio:
+            self.voice = voice
+            return None
+        return {
+            "type": "error",
+            "error": {"type": "invalid_request_error", "code": "cannot_update_voice",
+                      "message": "Cannot update a conversation's voice if assistant audio is present."},
+        }
+
+    def input_usage(self):
+        text = self.instructions_tokens + sum(t for t, _ in self.items.values())
+        audio = sum(a for _, a in self.items.values())
+        return text, audio
+
+
+class MockRealtimeServer:
+    """Local stand-in for the Realtime API used by the pool, load tests and benchmarks.
+
+    Speaks the subset of the event protocol this project relies on. Every
+    response.create is answered with a short synthetic audio reply, or, if
+    recording is given (a path or a list of timelines), with the next
+    recorded response, cycling per connection. A reply streams in the
+    background, so response.cancel and conversation.item.truncate can
+    interrupt it the way they do upstream. As upstream, a connection's voice
+    cannot change once it has produced audio. Replies are paced by their
+    timelines: time_scale stretches them (0 sends everything at once),
+    latency delays the first event, jitter adds up to that many seconds of
+    seeded random delay per event, and chunk_ms re-splits recorded audio.
+    Ids come from a counter, so the same seed gives the same run.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, reply_seconds=1.0, chunk_ms=100, delta_interval=0.0,
+                 transcript="This is a mock reply from the local Realtime server.", recording=None,
+                 time_scale=1.0, latency=0.0, jitter=0.0, seed=0):
+        self.host = host
+        self.port = port
+        self.reply_seconds = reply_seconds
+        self.chunk_ms = chunk_ms
+        self.delta_interval = delta_interval
+        self.transcript = transcript
+        self.time_scale = time_scale
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        if isinstance(recording, str):
+            recording = load_recording(recording)
+        if recording:
+            self.responses = [rechunk_audio(timeline, chunk_ms) for timeline in recording]
+        else:
+            self.responses = [synthetic_response(reply_seconds, chunk_ms, delta_interval, transcript)]
+        self.connections = 0
+        self.open_connections = 0
+        self.appended_bytes = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.frames_sent = 0
+        self.frames_received = 0
+        self._ids = itertools.count(1)
+        self._rng = random.Random(seed)
+        self._server = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/v1/realtime"
+
+    def reset_stats(self):
+        self.bytes_sent = self.bytes_received = 0
+        self.frames_sent = self.frames_received = 0
+        self.appended_bytes = 0
+
+    def new_id(self, prefix):
+        return f"{prefix}_{next(self._ids):012d}"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def send(self, ws, event):
+        message = json.dumps(event)
+        self.bytes_sent += len(message)
+        self.frames_sent += 1
+        await ws.send(message)
+
+    async def _handler(self, ws, path=None):
+        conversation = MockConversation()
+        self.connections += 1
+        self.open_connections += 1
+        try:
+            await self.send(ws, {"type": "session.created", "session": {"id": self.new_id("sess")}})
+            async for message in ws:
+                self.bytes_received += len(message)
+                self.frames_received += 1
+                event = json.loads(message)
+                if not isinstance(event, dict):
+                    await self.send(ws, {
+                        "type": "error",
+                        "error": {"type": "invalid_request_error", "message": "Expected an event object."},
+                    })
+                    continue
+                await self.handle_event(ws, event, conversation)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if conversation.response_task is not None:
+                conversation.response_task.cancel()
+            self.open_connections -= 1
+
+    async def handle_event(self, ws, event, conversation):
+        event_type = event.get('type')
+
+        if event_type == 'conversation.item.create':
+            item = dict(event.get('item', {}))
+            item.setdefault('id', self.new_id("item"))
+            conversation.items[item['id']] = estimate_tokens(item)
+            await self.send(ws, {"type": "conversation.item.created", "item": item})
+
+        elif event_type == 'conversation.item.delete':
+            item_id = event.get('item_id')
+            if conversation.items.pop(item_id, None) is None:
+                await self.send(ws, {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "message": f"Item {item_id} does not exist."},
+                })
+            else:
+                await self.send(ws, {"type": "conversation.item.deleted", "item_id": item_id})
+
+        elif event_type == 'input_audio_buffer.append':
+            appended = len(base64.b64decode(event.get('audio', '')))
+            self.appended_bytes += appended
+            conversation.pending_audio_bytes += appended
+
+        elif event_type == 'input_audio_buffer.commit':
+            item_id = self.new_id("item")
+            seconds = conversation.pending_audio_bytes / (SAMPLE_RATE * 2)
+            conversation.items[item_id] = (0, int(seconds * AUDIO_TOKENS_PER_SECOND) + 1)
+            conversation.pending_audio_bytes = 0
+            await self.send(ws, {"type": "input_audio_buffer.committed", "item_id": item_id})
+            await self.send(ws, {
+                "type": "conversation.item.created",
+                "item": {"id": item_id, "type": "message", "role": "user"},
+            })
+
+        elif event_type == 'session.update':
+            error = conversation.voice_error(event.get('session', {}).get('voice'))
+            if error is not None:
+                await self.send(ws, error)
+                return
+            instructions = event.get('session', {}).get('instructions')
+            if instructions is not None:
+                conversation.instructions_tokens = len(instructions) // CHARS_PER_TOKEN
+            await self.send(ws, {"type": "session.updated", "session": event.get('session', {})})
+
+        elif event_type == 'response.create':
+            if conversation.response_task is not None and not conversation.response_task.done():
+                await self.send(ws, {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "code": "conversation_already_has_active_response",
+                              "message": "Conversation already has an active response."},
+                })
+                return
+            error = conversation.voice_error(event.get('response', {}).get('voice'))
+            if error is not None:
+                await self.send(ws, error)
+                return
+            conversation.response_task = asyncio.create_task(
+                self.send_response(ws, conversation, event.get('response', {}))
+            )
+
+        elif event_type == 'response.cancel':
+            task = conversation.response_task
+            if task is None or task.done():
+                await self.send(ws, {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "code": "response_cancel_not_active",
+                              "message": "Cancellation failed: no active response found."},
+                })
+            else:
+                task.cancel()
+                await asyncio.wait([task])
+
+        elif event_type == 'conversation.item.truncate':
+            item_id = event.get('item_id')
+            if item_id not in conversation.items:
+                await self.send(ws, {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "message": f"Item {item_id} does not exist."},
+                })
+                return
+            audio_end_ms = event.get('audio_end_ms', 0)
+            text_tokens, _ = conversation.items[item_id]
+            conversation.items[item_id] = (text_tokens, int(audio_end_ms / 1000 * AUDIO_TOKENS_PER_SECOND))
+            await self.send(ws, {
+                "type": "conversation.item.truncated",
+                "item_id": item_id,
+                "content_index": event.get('content_index', 0),
+                "audio_end_ms": audio_end_ms,
+            })
+
+    async def send_response(self, ws, conversation, options):
+        response_id = self.new_id("resp")
+        item_id = self.new_id("item")
+        timeline = self.responses[conversation.responses % len(self.responses)]
+        conversation.responses += 1
+        status = "completed"
+        sent = []
+
+        await self.send(ws, {"type": "response.created", "response": {"id": response_id}})
+        # The item exists from the first delta, so it can be truncated mid-reply
+        conversation.items[item_id] = (0, 0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        previous = 0.0
+        try:
+            for t, event in timeline:
+                t = self.latency + t * self.time_scale
+                if self.jitter:
+                    t += self._rng.uniform(0, self.jitter)
+                t = previous = max(previous, t)
+                delay = started + t - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                event = dict(event)
+                event.update(response_id=response_id, item_id=item_id)
+                await self.send(ws, event)
+                sent.append((t, event))
+                if event['type'] == 'response.audio.delta':
+                    conversation.has_audio = True
+        except asyncio.CancelledError:
+            status = "cancelled"
+        except websockets.exceptions.ConnectionClosed:
+            return
+
+        transcript = timeline_transcript(timeline) if status == "completed" else ""
+        text_in, audio_in = conversation.input_usage()
+        if options.get('instructions'):
+            text_in += len(options['instructions']) // CHARS_PER_TOKEN - conversation.instructions_tokens
+        text_out = len(transcript) // CHARS_PER_TOKEN if transcript else 0
+        audio_out = int(audio_seconds(sent) * AUDIO_TOKENS_PER_SECOND)
+        conversation.items[item_id] = (text_out, audio_out)
+
+        try:
+            await self.send(ws, {
+                "type": "response.done",
+                "response": {
+                    "id": response_id,
+                    "status": status,
+                    "usage": {
+                        "total_tokens": text_in + audio_in + text_out + audio_out,
+                        "input_tokens": text_in + audio_in,
+                        "output_tokens": text_out + audio_out,
+                        "input_token_details": {"text_tokens": text_in, "audio_tokens": audio_in},
+                        "output_token_details": {"text_tokens": text_out, "audio_tokens": audio_out},
+                    },
+                },
+            })
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+class RecordingProxy:
+    """Forwards local connections to the real Realtime API and records replies.
+
+    Every server event between response.created and response.done is saved
+    with its offset from response.created, in the format MockRealtimeServer
+    replays. The file is rewritten after each response.
+    """
+
+    def __init__(self, upstream_url, headers, path, host="127.0.0.1", port=0):
+        self.upstream_url = upstream_url
+        self.headers = headers
+        self.path = path
+        self.host = host
+        self.port = port
+        self.responses = []
+        self._server = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/v1/realtime"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"responses": self.responses}, f)
+
+    async def _handler(self, ws, path=None):
+        async with websockets.connect(self.upstream_url, extra_headers=self.headers, max_size=None) as upstream:
+            async def forward_client():
+                async for message in ws:
+                    await upstream.send(message)
+
+            async def forward_upstream():
+                response, started = None, None
+                async for message in upstream:
+                    await ws.send(message)
+                    event = json.loads(message)
+                    if event.get('type') == 'response.created':
+                        response, started = [], time.monotonic()
+                    if response is not None:
+                        response.append({"t": round(time.monotonic() - started, 4), "event": event})
+                    if event.get('type') == 'response.done' and response is not None:
+                        self.responses.append(response)
+                        self.save()
+                        print(f"Recorded response {len(self.responses)} ({len(response)} events)")
+                        response = None
+
+            tasks = [asyncio.create_task(forward_client()), asyncio.create_task(forward_upstream())]
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+
+async def run_forever(host, port, **kwargs):
+    async with MockRealtimeServer(host, port, **kwargs) as server:
+        print(f"Mock Realtime server listening on {server.url}")
+        await asyncio.Future()
+
+
+async def record_forever(host, port, path, upstream_url):
+    from .realtime_session import realtime_headers
+
+    async with RecordingProxy(upstream_url, realtime_headers(), path, host, port) as proxy:
+        print(f"Recording proxy listening on {proxy.url}, saving to {path}")
+        await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the OpenAI Realtime API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reply-seconds", type=float, default=1.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--delta-interval", type=float, default=0.0)
+    parser.add_argument("--recording", help="replay responses from this recording")
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", metavar="PATH",
+                        help="proxy to --upstream and record its responses to PATH instead")
+    parser.add_argument("--upstream", default="wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-10-01")
+    args = parser.parse_args()
+    if args.record:
+        asyncio.run(record_forever(args.host, args.port, args.record, args.upstream))
+    else:
+        asyncio.run(run_forever(
+            args.host, args.port, reply_seconds=args.reply_seconds, chunk_ms=args.chunk_ms,
+            delta_interval=args.delta_interval, recording=args.recording, time_scale=args.time_scale,
+            latency=args.latency, jitter=args.jitter, seed=args.seed,
+        ))
+
+
+if __name__ == "__main__":
+    main()
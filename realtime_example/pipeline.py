@@ -0,0 +1,133 @@
+import time
+import asyncio
+
+_DONE = object()
+
+
+class StageTimings:
+    """Busy time per pipeline stage, plus wall time for the whole run."""
+
+    def __init__(self):
+        self.stages = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, stage, seconds):
+        stats = self.stages.setdefault(stage, {"items": 0, "total": 0.0, "max": 0.0})
+        stats["items"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+
+    @property
+    def wall(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self):
+        stages = {
+            name: {
+                "items": stats["items"],
+                "total_s": round(stats["total"], 3),
+                "mean_ms": round(stats["total"] / stats["items"] * 1000, 1),
+                "max_ms": round(stats["max"] * 1000, 1),
+            }
+            for name, stats in self.stages.items()
+        }
+        busy = sum(stats["total"] for stats in self.stages.values())
+        return {"wall_s": round(self.wall, 3), "busy_s": round(busy, 3), "stages": stages}
+
+
+class Pipeline:
+    """Runs items from an async source through a chain of async stages.
+
+    Each stage is a single worker connected to the next by a bounded queue,
+    so stage N works on item i while stage N-1 is already on item i+1,
+    order is preserved, and a slow downstream stage applies backpressure
+    once queue_size items are waiting. With sequential=True each item goes
+    through every stage before the next one is pulled, which is useful as a
+    baseline.
+
+    If the source fails, items it already produced still flow through the
+    remaining stages before the error is raised; a failing stage cancels
+    the whole run.
+    """
+
+    def __init__(self, stages, queue_size=2, sequential=False, timings=None):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.sequential = sequential
+        self.timings = timings or StageTimings()
+
+    async def _timed(self, name, step, item):
+        started = time.perf_counter()
+        try:
+            return await step(item)
+        finally:
+            self.timings.record(name, time.perf_counter() - started)
+
+    async def _next(self, name, iterator):
+        started = time.perf_counter()
+        item = await iterator.__anext__()
+        self.timings.record(name, time.perf_counter() - started)
+        return item
+
+    async def run(self, source, source_name="source"):
+        try:
+            if self.sequential:
+                await self._run_sequential(source, source_name)
+            else:
+                await self._run_pipelined(source, source_name)
+        finally:
+            self.timings.finished = time.perf_counter()
+        return self.timings
+
+    async def _run_sequential(self, source, source_name):
+        iterator = source.__aiter__()
+        while True:
+            try:
+                item = await self._next(source_name, iterator)
+            except StopAsyncIteration:
+                return
+            for name, step in self.stages:
+                item = await self._timed(name, step, item)
+
+    async def _run_pipelined(self, source, source_name):
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        source_error = None
+
+        async def feed():
+            nonlocal source_error
+            iterator = source.__aiter__()
+            try:
+                while True:
+                    try:
+                        item = await self._next(source_name, iterator)
+                    except StopAsyncIteration:
+                        break
+                    await queues[0].put(item)
+            except Exception as e:
+                source_error = e
+            await queues[0].put(_DONE)
+
+        async def work(index, name, step):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    break
+                item = await self._timed(name, step, item)
+                if outbox is not None:
+                    await outbox.put(item)
+            if outbox is not None:
+                await outbox.put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        tasks += [asyncio.create_task(work(i, name, step)) for i, (name, step) in enumerate(self.stages)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if source_error is not None:
+            raise source_error
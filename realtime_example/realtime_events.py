@@ -0,0 +1,167 @@
+import os
+import json
+import inspect
+from typing import Optional
+
+# Which JSON library parses server events: auto, orjson, msgspec or json
+JSON_BACKEND = os.getenv("REALTIME_JSON_BACKEND", "auto")
+
+AUDIO_DELTA = "response.audio.delta"
+
+# Audio deltas are recognised by their type appearing this early in the
+# frame; the API sends "type" first, and base64 cannot contain a quote, so
+# the check never matches inside the payload.
+_AUDIO_DELTA_MARKER = f'"{AUDIO_DELTA}"'
+_HEAD = 96
+_DELTA_KEY = '"delta":"'
+
+
+class AudioDelta:
+    """A response.audio.delta event; delta is still base64 text."""
+
+    __slots__ = ("type", "delta", "item_id", "response_id")
+
+    def __init__(self, delta, item_id=None, response_id=None):
+        self.type = AUDIO_DELTA
+        self.delta = delta
+        self.item_id = item_id
+        self.response_id = response_id
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+
+def _available_backend(name):
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+            return "msgspec", msgspec
+        except ImportError:
+            if name == "msgspec":
+                raise
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson
+        except ImportError:
+            if name == "orjson":
+                raise
+    return "json", json
+
+
+class EventParser:
+    """Parses Realtime server frames, with a fast path for audio deltas.
+
+    Audio deltas make up almost all of the bytes in a reply but only a few
+    of their fields matter. With msgspec they are decoded straight into a
+    struct that ignores everything else; with orjson the whole frame is
+    parsed, just faster; with the stdlib the base64 payload is sliced out
+    of the frame and only the small remainder goes through json.loads.
+    Other events are parsed into plain dicts.
+    """
+
+    def __init__(self, backend=JSON_BACKEND):
+        self.backend, module = _available_backend(backend)
+        if self.backend == "msgspec":
+            class _Delta(module.Struct):
+                type: str
+                delta: str
+                item_id: Optional[str] = None
+                response_id: Optional[str] = None
+
+            self._delta_decoder = module.json.Decoder(_Delta)
+            self.loads = module.json.Decoder().decode
+            self._parse_delta = self._parse_delta_msgspec
+        elif self.backend == "orjson":
+            self.loads = module.loads
+            self._parse_delta = self._parse_delta_dict
+        else:
+            self.loads = json.loads
+            self._parse_delta = self._parse_delta_stdlib
+
+    def parse(self, message):
+        """Return (event_type, event) for one frame."""
+        if isinstance(message, str) and _AUDIO_DELTA_MARKER in message[:_HEAD]:
+            event = self._parse_delta(message)
+            if event is not None:
+                return AUDIO_DELTA, event
+        event = self.loads(message)
+        if not isinstance(event, dict):
+            return None, event
+        event_type = event.get('type')
+        if event_type == AUDIO_DELTA:
+            return event_type, AudioDelta(event.get('delta', ''), event.get('item_id'), event.get('response_id'))
+        return event_type, event
+
+    def _parse_delta_msgspec(self, message):
+        try:
+            event = self._delta_decoder.decode(message)
+        except Exception:
+            return None
+        if event.type != AUDIO_DELTA:
+            return None
+        return AudioDelta(event.delta, event.item_id, event.response_id)
+
+    def _parse_delta_dict(self, message):
+        event = self.loads(message)
+        if event.get('type') != AUDIO_DELTA:
+            return None
+        return AudioDelta(event.get('delta', ''), event.get('item_id'), event.get('response_id'))
+
+    def _parse_delta_stdlib(self, message):
+        start = message.find(_DELTA_KEY)
+        if start < 0:
+            return None
+        start += len(_DELTA_KEY)
+        end = message.find('"', start)
+        delta = message[start:end]
+        if end < 0 or '\\' in delta:
+            # Escaped payloads are rare; let json.loads handle them
+            return None
+        meta = json.loads(message[:start - 1] + 'null' + message[end + 1:])
+        if meta.get('type') != AUDIO_DELTA:
+            return None
+        return AudioDelta(delta, meta.get('item_id'), meta.get('response_id'))
+
+
+default_parser = EventParser()
+
+STOP = object()
+
+
+class EventDispatcher:
+    """Routes server events to the handler registered for their type.
+
+    Handlers take the parsed event and may be plain functions or
+    coroutines. dispatch() returns whatever the handler returned, so a
+    receive loop can yield audio from a handler or stop on STOP. Events
+    without a handler go to default, if given.
+    """
+
+    def __init__(self, parser=None, default=None):
+        self.parser = parser or default_parser
+        self.handlers = {}
+        self.default = default
+
+    def on(self, event_type):
+        def register(handler):
+            self.handlers[event_type] = handler
+            return handler
+        return register
+
+    async def dispatch(self, message):
+        event_type, event = self.parser.parse(message)
+        handler = self.handlers.get(event_type, self.default)
+        if handler is None:
+            return None
+        result = handler(event)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def run(self, ws):
+        """Dispatch frames from ws until a handler returns STOP."""
+        async for message in ws:
+            if await self.dispatch(message) is STOP:
+                return True
+        return False
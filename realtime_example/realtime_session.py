@@ -0,0 +1,292 @@
+import os
+import json
+import time
+import asyncio
+import statistics
+from collections import deque
+from contextlib import asynccontextmanager
+
+import websockets
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REALTIME_URL = os.getenv(
+    "OPENAI_REALTIME_URL",
+    "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-10-01",
+)
+
+
+def realtime_headers(api_key=None):
+    """Build the headers needed to open a Realtime API session."""
+    api_key = api_key or os.getenv('OPENAI_API_KEY')
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "OpenAI-Beta": "realtime=v1",
+    }
+
+
+class RealtimeSession:
+    """A single long-lived Realtime WebSocket connection."""
+
+    def __init__(self, ws, handshake_time):
+        self.ws = ws
+        self.handshake_time = handshake_time
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.conversation_id = None
+        self.lock = asyncio.Lock()
+        self.turns = 0
+        self.manual_turns = False
+
+    @property
+    def closed(self):
+        return self.ws.closed
+
+    @property
+    def idle_for(self):
+        return time.monotonic() - self.last_used
+
+    async def send(self, event):
+        """Send an event, serialising dicts to JSON."""
+        if not isinstance(event, (str, bytes)):
+            event = json.dumps(event)
+        await self.ws.send(event)
+
+    async def close(self):
+        try:
+            await self.ws.close()
+        except Exception as e:
+            print(f"Error closing WebSocket: {e}")
+
+
+class RealtimeSessionPool:
+    """Keeps one Realtime session per conversation plus a small warm pool.
+
+    Sessions bound to a conversation keep their server-side conversation
+    state between turns. Warm sessions are pre-connected and handed to new
+    conversations (or one-shot requests) so the TCP+TLS+upgrade handshake
+    happens off the turn's critical path.
+    """
+
+    def __init__(
+        self,
+        url=None,
+        headers=None,
+        warm_size=1,
+        max_sessions=64,
+        idle_timeout=300.0,
+        ping_interval=20.0,
+        ping_timeout=20.0,
+        connect=None,
+    ):
+        self.url = url or REALTIME_URL
+        self.headers = headers
+        self.warm_size = warm_size
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self._connect = connect or websockets.connect
+
+        self._sessions = {}
+        self._warm = deque()
+        self._connecting = 0
+        self._tasks = set()
+        self._reaper = None
+        self._closed = False
+
+        self.metrics = {
+            "conversation_hits": 0,
+            "warm_hits": 0,
+            "misses": 0,
+            "handshakes": 0,
+            "handshake_errors": 0,
+            "evictions": 0,
+        }
+        self._handshake_times = deque(maxlen=1000)
+
+    async def start(self):
+        """Start the idle reaper and fill the warm pool."""
+        if self._reaper is None:
+            self._closed = False
+            interval = max(1.0, self.idle_timeout / 4)
+            self._reaper = asyncio.create_task(self._reap_forever(interval))
+        self._refill()
+
+    async def _open(self):
+        headers = self.headers if self.headers is not None else realtime_headers()
+        started = time.perf_counter()
+        try:
+            ws = await self._connect(
+                self.url,
+                extra_headers=headers,
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_timeout,
+            )
+        except Exception:
+            self.metrics["handshake_errors"] += 1
+            raise
+        handshake_time = time.perf_counter() - started
+        self.metrics["handshakes"] += 1
+        self._handshake_times.append(handshake_time)
+        return RealtimeSession(ws, handshake_time)
+
+    def _refill(self):
+        """Top the warm pool back up in the background."""
+        if self._closed:
+            return
+        missing = self.warm_size - len(self._warm) - self._connecting
+        for _ in range(max(0, missing)):
+            self._connecting += 1
+            task = asyncio.create_task(self._open_warm())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _open_warm(self):
+        try:
+            session = await self._open()
+        except Exception as e:
+            print(f"Error pre-connecting WebSocket: {e}")
+            return
+        finally:
+            self._connecting -= 1
+        if self._closed:
+            await session.close()
+        else:
+            self._warm.append(session)
+
+    def _take_warm(self):
+        while self._warm:
+            session = self._warm.popleft()
+            if not session.closed:
+                return session
+        return None
+
+    async def acquire(self, conversation_id=None):
+        """Return the conversation's session, a warm one, or a new one."""
+        if self._reaper is None:
+            await self.start()
+
+        if conversation_id is not None:
+            session = self._sessions.get(conversation_id)
+            if session is not None and not session.closed:
+                self.metrics["conversation_hits"] += 1
+                session.last_used = time.monotonic()
+                return session
+            self._sessions.pop(conversation_id, None)
+
+        session = self._take_warm()
+        if session is not None:
+            self.metrics["warm_hits"] += 1
+        else:
+            self.metrics["misses"] += 1
+            session = await self._open()
+        self._refill()
+
+        session.last_used = time.monotonic()
+        if conversation_id is not None:
+            await self._make_room()
+            session.conversation_id = conversation_id
+            self._sessions[conversation_id] = session
+        return session
+
+    async def _make_room(self):
+        """Evict least recently used idle sessions above max_sessions."""
+        idle = sorted(
+            (s for s in self._sessions.values() if not s.lock.locked()),
+            key=lambda s: s.last_used,
+        )
+        while len(self._sessions) >= self.max_sessions and idle:
+            await self.discard(idle.pop(0))
+            self.metrics["evictions"] += 1
+
+    def release(self, session):
+        session.last_used = time.monotonic()
+        session.turns += 1
+
+    async def discard(self, session):
+        """Drop a session from the pool and close it."""
+        if session.conversation_id is not None:
+            if self._sessions.get(session.conversation_id) is session:
+                del self._sessions[session.conversation_id]
+        await session.close()
+
+    async def close_conversation(self, conversation_id):
+        session = self._sessions.get(conversation_id)
+        if session is not None:
+            await self.discard(session)
+
+    @asynccontextmanager
+    async def session(self, conversation_id=None):
+        """Hold a session for one turn.
+
+        Turns on the same conversation are serialised. Sessions without a
+        conversation id are closed afterwards, as are sessions whose turn
+        raised, since their server-side state is unknown.
+        """
+        session = await self.acquire(conversation_id)
+        async with session.lock:
+            try:
+                yield session
+            except BaseException:
+                await self.discard(session)
+                raise
+            self.release(session)
+            if conversation_id is None:
+                await session.close()
+
+    async def reap(self):
+        """Close idle or dead sessions and refill the warm pool."""
+        for session in list(self._sessions.values()):
+            if session.closed or (
+                not session.lock.locked() and session.idle_for > self.idle_timeout
+            ):
+                await self.discard(session)
+                self.metrics["evictions"] += 1
+
+        now = time.monotonic()
+        fresh = deque()
+        while self._warm:
+            session = self._warm.popleft()
+            if session.closed or now - session.created_at > self.idle_timeout:
+                await session.close()
+                self.metrics["evictions"] += 1
+            else:
+                fresh.append(session)
+        self._warm = fresh
+        self._refill()
+
+    async def _reap_forever(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                print(f"Error reaping sessions: {e}")
+
+    async def close(self):
+        """Close every session and stop background tasks."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for task in list(self._tasks):
+            task.cancel()
+        sessions = list(self._sessions.values()) + list(self._warm)
+        self._sessions.clear()
+        self._warm.clear()
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+
+    def stats(self):
+        """Return pool counters and handshake latency in milliseconds."""
+        stats = dict(self.metrics)
+        lookups = stats["conversation_hits"] + stats["warm_hits"] + stats["misses"]
+        stats["hit_rate"] = (lookups - stats["misses"]) / lookups if lookups else 0.0
+        stats["active_sessions"] = len(self._sessions)
+        stats["warm_sessions"] = len(self._warm)
+        times = list(self._handshake_times)
+        if times:
+            stats["handshake_ms_mean"] = statistics.fmean(times) * 1000
+            stats["handshake_ms_max"] = max(times) * 1000
+        return stats
@@ -0,0 +1,89 @@
+import os
+import json
+import hashlib
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from .disk_cache import DiskLRU
+
+# off, on (read and write) or replay (read only; a miss fails the turn)
+CACHE_MODE = os.getenv("PODCAST_RESPONSE_CACHE", "off")
+CACHE_DIR = os.getenv("PODCAST_RESPONSE_CACHE_DIR", os.path.join(".cache", "responses"))
+CACHE_MAX_BYTES = int(float(os.getenv("PODCAST_RESPONSE_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+
+CACHE_MODES = ("off", "on", "replay")
+
+
+def url_model(url):
+    """The model named in a Realtime URL's query string, if any."""
+    return parse_qs(urlparse(url).query).get("model", [""])[0]
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def response_key(model, voice, instructions_hash, prefix_key, cue, context=None):
+    """Content address of a reply.
+
+    prefix_key is the key of the previous turn, so each key covers the
+    whole conversation before it without re-hashing it every turn; context
+    is any other text in the conversation, such as a recap.
+    """
+    parts = [model, voice, instructions_hash, prefix_key, cue, context]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """On-disk cache of podcast replies, addressed by response_key().
+
+    Each entry is the reply's PCM16 audio as a .npy file, read back
+    memory-mapped so a hit costs no copy until the audio is used, and a
+    small .json file with the transcript and token usage. Entries live in a
+    DiskLRU: hits refresh the audio file's mtime and the least recently used
+    entries are evicted once max_bytes is exceeded. In replay mode nothing
+    is written.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, mode="on"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode {mode!r}; expected one of {CACHE_MODES}")
+        # Audio first, so an entry only counts once its .json exists
+        self.files = DiskLRU(directory, max_bytes, (".npy", ".json"))
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def replay(self):
+        return self.mode == "replay"
+
+    def __contains__(self, key):
+        return os.path.exists(self.files.path(key, ".json"))
+
+    def get(self, key):
+        """Return {"pcm", "transcript", "usage"} for key, or None."""
+        try:
+            with open(self.files.path(key, ".json"), encoding="utf-8") as f:
+                entry = json.load(f)
+            pcm = np.load(self.files.path(key, ".npy"), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        self.files.touch(key)
+        self.hits += 1
+        return {"pcm": pcm, "transcript": entry.get("transcript"), "usage": entry.get("usage") or {}}
+
+    def put(self, key, pcm, transcript, usage):
+        if self.replay:
+            return
+        pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        entry = json.dumps({"transcript": transcript, "usage": usage}).encode("utf-8")
+        self.files.put(key, {
+            ".npy": lambda f: np.save(f, pcm, allow_pickle=False),
+            ".json": lambda f: f.write(entry),
+        })
+
+    def stats(self):
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,181 @@
+import os
+import re
+import zlib
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+INDEX_CACHE_DIR = os.getenv("PODCAST_INDEX_CACHE_DIR", os.path.join(".cache", "source_index"))
+CHUNK_WORDS = int(os.getenv("PODCAST_CHUNK_WORDS", "200"))
+# Indexes kept loaded in memory, least recently used dropped first
+MAX_LOADED_INDEXES = int(os.getenv("PODCAST_LOADED_INDEXES", "8"))
+
+# Terms are hashed into this many buckets instead of keeping a vocabulary
+HASH_BUCKETS = 1 << 18
+# Bump when chunking or scoring changes, so cached indexes are rebuilt
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"\w+")
+# Citation markers like [1] carry no meaning for retrieval
+_CITATION = re.compile(r"\[\d+\]")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def chunk_text(text, chunk_words=CHUNK_WORDS, overlap=None):
+    """Split text into chunks of about chunk_words words.
+
+    Paragraphs are kept together where they fit; longer ones are split
+    into windows that overlap by a fifth of a chunk, so a sentence cut at
+    a boundary still appears whole in one of them.
+    """
+    if overlap is None:
+        overlap = chunk_words // 5
+    chunks = []
+    current = []
+    for paragraph in re.split(r"\n\s*\n", _CITATION.sub("", text)):
+        words = paragraph.split()
+        if not words:
+            continue
+        if current and len(current) + len(words) > chunk_words:
+            chunks.append(" ".join(current))
+            current = []
+        if len(words) <= chunk_words:
+            current += words
+            continue
+        step = chunk_words - overlap
+        for start in range(0, len(words) - overlap, step):
+            chunks.append(" ".join(words[start:start + chunk_words]))
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _term_ids(tokens, cache):
+    ids = np.empty(len(tokens), dtype=np.int64)
+    for i, token in enumerate(tokens):
+        term = cache.get(token)
+        if term is None:
+            # crc32 rather than hash(), which changes between processes
+            term = cache[token] = zlib.crc32(token.encode("utf-8")) % HASH_BUCKETS
+        ids[i] = term
+    return ids
+
+
+class SourceIndex:
+    """BM25 index over the chunks of one source document.
+
+    Term frequencies are kept as a sparse chunk-by-term matrix in CSR form
+    (indptr, terms, counts) over hashed term ids, so the index is a handful
+    of flat numpy arrays: cheap to build, score and save. Scoring a query
+    touches every stored (chunk, term) pair once.
+    """
+
+    def __init__(self, chunks, indptr, terms, counts, k1=1.5, b=0.75):
+        self.chunks = chunks
+        self.indptr = indptr
+        self.terms = terms
+        self.counts = counts
+        self.k1 = k1
+        self.b = b
+
+        lengths = np.diff(indptr)
+        self.rows = np.repeat(np.arange(len(chunks)), lengths)
+        doc_lengths = np.bincount(self.rows, weights=counts, minlength=len(chunks))
+        avg_length = doc_lengths.mean() if len(chunks) else 0.0
+        doc_freq = np.bincount(terms, minlength=HASH_BUCKETS)
+        self.idf = np.log1p((len(chunks) - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        # The term-frequency part of BM25 depends only on the document, so it
+        # is computed once here rather than on every query
+        norm = self.k1 * (1 - self.b + self.b * doc_lengths / max(avg_length, 1e-9))
+        self.weights = (counts * (self.k1 + 1) / (counts + norm[self.rows])).astype(np.float32)
+
+    @classmethod
+    def build(cls, text, chunk_words=CHUNK_WORDS):
+        chunks = chunk_text(text, chunk_words)
+        cache = {}
+        indptr = [0]
+        terms = []
+        counts = []
+        for chunk in chunks:
+            ids, tf = np.unique(_term_ids(tokenize(chunk), cache), return_counts=True)
+            terms.append(ids)
+            counts.append(tf)
+            indptr.append(indptr[-1] + len(ids))
+        return cls(
+            chunks,
+            np.array(indptr, dtype=np.int64),
+            np.concatenate(terms) if terms else np.empty(0, dtype=np.int64),
+            np.concatenate(counts).astype(np.float32) if counts else np.empty(0, dtype=np.float32),
+        )
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def scores(self, query):
+        query_terms = np.unique(_term_ids(tokenize(query), {}))
+        hits = np.isin(self.terms, query_terms)
+        contributions = self.idf[self.terms[hits]] * self.weights[hits]
+        return np.bincount(self.rows[hits], weights=contributions, minlength=len(self.chunks))
+
+    def search(self, query, k=3, exclude=()):
+        """Return the indices of the k best chunks for query, best first.
+
+        Chunks in exclude are skipped, and chunks matching no query term
+        are never returned.
+        """
+        scores = self.scores(query)
+        if exclude:
+            scores[list(exclude)] = 0.0
+        ranked = np.argsort(-scores, kind="stable")[:k]
+        return [int(i) for i in ranked if scores[i] > 0]
+
+    def save(self, path):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, chunks=np.array(self.chunks, dtype=object).astype(str), indptr=self.indptr,
+                     terms=self.terms, counts=self.counts)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["chunks"].tolist(), data["indptr"], data["terms"], data["counts"])
+
+
+def index_path(text, chunk_words=CHUNK_WORDS, directory=INDEX_CACHE_DIR):
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{chunk_words}:{text}".encode("utf-8")).hexdigest()
+    return os.path.join(directory, f"{digest}.npz")
+
+
+# Indexes already loaded in this process, e.g. shared by a batch's
+# episodes, most recently used last
+_loaded = OrderedDict()
+_lock = threading.Lock()
+
+
+def load_index(text, chunk_words=CHUNK_WORDS, directory=INDEX_CACHE_DIR):
+    """Return the document's index, building and caching it on first use."""
+    path = index_path(text, chunk_words, directory)
+    with _lock:
+        index = _loaded.get(path)
+        if index is not None:
+            _loaded.move_to_end(path)
+            return index
+        try:
+            index = SourceIndex.load(path)
+        except (FileNotFoundError, ValueError, KeyError):
+            index = SourceIndex.build(text, chunk_words)
+            index.save(path)
+            print(f"Indexed source into {len(index)} chunks: {path}")
+        _loaded[path] = index
+        while len(_loaded) > MAX_LOADED_INDEXES:
+            _loaded.popitem(last=False)
+        return index
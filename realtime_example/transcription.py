@@ -0,0 +1,251 @@
+import os
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE, pcm16_to_wav, resample
+from .disk_cache import DiskLRU
+
+TRANSCRIBE_RATE = 16000
+
+# api (the Whisper API) or local (openai-whisper on this machine's CPU)
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "api")
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "turbo")
+LOCAL_WHISPER_WORKERS = int(os.getenv("LOCAL_WHISPER_WORKERS", "2"))
+LOCAL_WHISPER_BATCH = int(os.getenv("LOCAL_WHISPER_BATCH", "4"))
+LOCAL_WHISPER_BATCH_MS = int(os.getenv("LOCAL_WHISPER_BATCH_MS", "50"))
+
+CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", os.path.join(".cache", "transcripts"))
+CACHE_MAX_BYTES = int(float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+
+def audio_hash(pcm):
+    return hashlib.sha256(memoryview(pcm).cast('B')).hexdigest()
+
+
+class TranscriptCache:
+    """On-disk transcript cache keyed by the SHA-256 of the PCM audio.
+
+    Entries are small text files in a DiskLRU; reads refresh the file's
+    mtime so the oldest-used entries are evicted first once max_bytes is
+    exceeded.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.files = DiskLRU(directory, max_bytes, (".txt",))
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        try:
+            with open(self.files.path(key), encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.files.touch(key)
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        data = text.encode("utf-8")
+        self.files.put(key, {".txt": lambda f: f.write(data)})
+
+
+def whisper_input(pcm):
+    """24 kHz mono PCM16 as the 16 kHz float32 samples in [-1, 1] Whisper works on."""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    return resample(samples, SAMPLE_RATE, TRANSCRIBE_RATE) / 32768.0
+
+
+def whisper_transcribe(pcm, client):
+    """Blocking Whisper API call for 24 kHz mono PCM16 audio.
+
+    The audio is downsampled to 16 kHz, which is what Whisper works at, and
+    uploaded as an in-memory WAV, so nothing is encoded or written to disk
+    and concurrent calls share no state.
+    """
+    samples = whisper_input(pcm) * 32768.0
+    wav = pcm16_to_wav(np.clip(samples, -32768, 32767).astype(np.int16), TRANSCRIBE_RATE)
+
+    transcript = client.audio.transcriptions.create(
+        model="whisper-1",
+        file=("speech.wav", wav, "audio/wav")
+    )
+    return transcript.text
+
+
+class ApiTranscriber:
+    """Transcribes with the Whisper API from a worker thread.
+
+    get_client is called for every request, so the client is only created
+    once something actually needs transcribing.
+    """
+
+    name = "api"
+
+    def __init__(self, get_client):
+        self.get_client = get_client
+
+    async def transcribe(self, pcm):
+        return await asyncio.to_thread(whisper_transcribe, pcm, self.get_client())
+
+    def close(self):
+        pass
+
+
+def load_whisper_model(name):
+    import whisper
+    return whisper.load_model(name, device="cpu")
+
+
+# The model loaded by each LocalWhisperTranscriber worker process
+_worker_model = None
+
+
+def _load_worker_model(loader, name, loaded):
+    global _worker_model
+    _worker_model = loader(name)
+    loaded.release()
+
+
+def _worker_ready():
+    return _worker_model is not None
+
+
+def _transcribe_batch(batch):
+    return [_worker_model.transcribe(samples, fp16=False)["text"].strip() for samples in batch]
+
+
+class LocalWhisperTranscriber:
+    """Transcribes on this machine with openai-whisper in a process pool.
+
+    Each of the worker processes loads the model once, when it starts,
+    and keeps it for its lifetime; warm() starts them all up front. Calls
+    that arrive within batch_wait_ms of each other are sent to a worker
+    together, up to batch_size at a time, so a busy batch run pays one
+    round trip per batch instead of per turn. Audio goes to the workers as
+    16 kHz float32 arrays, with no temporary files. loader(name) must
+    return an object with whisper's transcribe(); it is called in the
+    workers, so it must be a picklable module-level function.
+    """
+
+    name = "local"
+
+    def __init__(self, model=LOCAL_WHISPER_MODEL, workers=LOCAL_WHISPER_WORKERS, batch_size=LOCAL_WHISPER_BATCH,
+                 batch_wait_ms=LOCAL_WHISPER_BATCH_MS, loader=load_whisper_model):
+        self.model = model
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self.loader = loader
+        self.batches = 0
+        self._executor = None
+        self._loaded = None
+        self._pending = []
+        self._flush_handle = None
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn rather than fork: forking a process that has threads
+            # running (or torch loaded) is not safe
+            context = multiprocessing.get_context("spawn")
+            # Released by each worker once its model is loaded
+            self._loaded = context.Semaphore(0)
+            self._executor = ProcessPoolExecutor(
+                self.workers,
+                mp_context=context,
+                initializer=_load_worker_model,
+                initargs=(self.loader, self.model, self._loaded),
+            )
+        return self._executor
+
+    async def warm(self):
+        """Start every worker and wait until each has loaded the model.
+
+        Submitting one task per worker at once makes the pool start them
+        all, but the tasks may all run on whichever worker loads first, so
+        the workers' own signals are counted instead. A worker that fails
+        to load breaks the pool, which the probe task then raises.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        await asyncio.gather(*(loop.run_in_executor(pool, _worker_ready) for _ in range(self.workers)))
+        loaded = 0
+        while loaded < self.workers:
+            if await asyncio.to_thread(self._loaded.acquire, True, 1.0):
+                loaded += 1
+            else:
+                await loop.run_in_executor(pool, _worker_ready)
+
+    async def transcribe(self, pcm):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((whisper_input(pcm), future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        futures = [future for _, future in batch]
+        done = asyncio.get_running_loop().run_in_executor(
+            self._pool(), _transcribe_batch, [samples for samples, _ in batch]
+        )
+
+        def deliver(done):
+            for index, future in enumerate(futures):
+                if future.done():
+                    continue
+                if done.cancelled():
+                    future.cancel()
+                elif done.exception() is not None:
+                    future.set_exception(done.exception())
+                else:
+                    future.set_result(done.result()[index])
+
+        done.add_done_callback(deliver)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+            self._loaded = None
+
+
+def make_transcriber(backend=TRANSCRIBE_BACKEND, get_client=None):
+    """Return the transcription backend named by backend: api or local."""
+    if backend == "api":
+        return ApiTranscriber(get_client)
+    if backend == "local":
+        return LocalWhisperTranscriber()
+    raise ValueError(f"Unknown transcription backend {backend!r}; expected api or local")
+
+
+async def transcribe_pcm(pcm, transcriber, cache=None):
+    """Transcribe PCM16 audio with transcriber, consulting the cache first.
+
+    Cache lookups and writes touch the disk, so they run in a thread.
+    """
+    key = audio_hash(pcm)
+    if cache is not None:
+        text = await asyncio.to_thread(cache.get, key)
+        if text is not None:
+            return text
+
+    text = await transcriber.transcribe(pcm)
+
+    if cache is not None and text:
+        await asyncio.to_thread(cache.put, key, text)
+    return text
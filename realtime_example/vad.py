@@ -0,0 +1,178 @@
+import numpy as np
+
+from .audio_buffer import SAMPLE_RATE
+
+
+class VADConfig:
+    """Tunable thresholds for voice activity detection and endpointing."""
+
+    def __init__(
+        self,
+        frame_ms=20,
+        threshold_db=-45.0,
+        noise_margin_db=10.0,
+        min_dynamic_range_db=20.0,
+        min_speech_ms=100,
+        hangover_ms=200,
+        end_silence_ms=700,
+        padding_ms=150,
+        sample_rate=SAMPLE_RATE,
+    ):
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.min_dynamic_range_db = min_dynamic_range_db
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self.end_silence_ms = end_silence_ms
+        self.padding_ms = padding_ms
+        self.sample_rate = sample_rate
+
+    @property
+    def frame_samples(self):
+        return self.sample_rate * self.frame_ms // 1000
+
+    def frames(self, ms):
+        return max(1, int(round(ms / self.frame_ms)))
+
+    @property
+    def initial_noise_floor_db(self):
+        """A floor low enough that any level above threshold_db counts as speech."""
+        return self.threshold_db - self.noise_margin_db
+
+
+def frame_energy_db(pcm, frame_samples):
+    """Return the RMS level in dBFS of each complete frame of PCM16 audio."""
+    count = len(pcm) // frame_samples
+    if count == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = pcm[:count * frame_samples].reshape(count, frame_samples).astype(np.float32)
+    power = np.einsum('ij,ij->i', frames, frames) / frame_samples
+    return 10.0 * np.log10(power / (32768.0 ** 2) + 1e-10)
+
+
+def speech_frames(levels_db, config, noise_floor_db=None):
+    """Classify frames as speech, using the louder of the fixed threshold
+    and the estimated noise floor plus a margin.
+
+    The floor is estimated from the quietest frames only when the clip spans
+    min_dynamic_range_db; a clip that is speech throughout has no quiet
+    frames, and its 10th percentile would be a speech level.
+    """
+    if len(levels_db) == 0:
+        return np.zeros(0, dtype=bool)
+    if noise_floor_db is None:
+        quiet, loud = np.percentile(levels_db, (10, 90))
+        if loud - quiet >= config.min_dynamic_range_db:
+            noise_floor_db = float(quiet)
+        else:
+            noise_floor_db = config.initial_noise_floor_db
+    threshold = max(config.threshold_db, noise_floor_db + config.noise_margin_db)
+    active = levels_db > threshold
+
+    # Drop bursts shorter than min_speech_ms, then bridge short gaps with a
+    # hangover so words are not split on brief pauses.
+    active = _remove_short_runs(active, config.frames(config.min_speech_ms))
+    hangover = config.frames(config.hangover_ms)
+    if hangover > 1 and active.any():
+        kernel = np.ones(hangover, dtype=np.int32)
+        active = np.convolve(active.astype(np.int32), kernel)[:len(active)] > 0
+    return active
+
+
+def _remove_short_runs(active, min_frames):
+    if min_frames <= 1 or not active.any():
+        return active
+    padded = np.concatenate(([False], active, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[0::2], edges[1::2]
+    keep = np.zeros(len(active) + 1, dtype=np.int32)
+    long_runs = (ends - starts) >= min_frames
+    np.add.at(keep, starts[long_runs], 1)
+    np.add.at(keep, ends[long_runs], -1)
+    return np.cumsum(keep[:-1]) > 0
+
+
+def trim_silence(pcm, config=None):
+    """Trim leading and trailing silence from PCM16 audio.
+
+    Returns an empty array if no speech is found. A little padding is left
+    on either side so word onsets and tails are not clipped.
+    """
+    config = config or VADConfig()
+    frame = config.frame_samples
+    active = speech_frames(frame_energy_db(pcm, frame), config)
+    voiced = np.flatnonzero(active)
+    if len(voiced) == 0:
+        return pcm[:0]
+    padding = config.frames(config.padding_ms)
+    start = max(0, voiced[0] - padding) * frame
+    end = min(len(active), voiced[-1] + 1 + padding) * frame
+    if voiced[-1] + 1 + padding >= len(active):
+        end = len(pcm)
+    return pcm[start:end]
+
+
+class Endpointer:
+    """Streaming end-of-utterance detector for 24 kHz PCM16 input.
+
+    Feed audio as it arrives with push(); it returns "start" when speech
+    begins, "end" once end_silence_ms of silence follows speech, and None
+    otherwise. The noise floor starts low enough that speech above
+    threshold_db is heard even if the stream opens mid-sentence, and
+    adapts slowly to the frames classed as silence.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or VADConfig()
+        self._carry = np.empty(0, dtype=np.int16)
+        self.noise_floor_db = None
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self.frames_seen = 0
+
+    def reset(self):
+        self._carry = np.empty(0, dtype=np.int16)
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def push(self, pcm):
+        config = self.config
+        frame = config.frame_samples
+        if len(self._carry):
+            pcm = np.concatenate((self._carry, pcm))
+        usable = len(pcm) - len(pcm) % frame
+        self._carry = pcm[usable:].copy()
+        levels = frame_energy_db(pcm[:usable], frame)
+        if len(levels) == 0:
+            return None
+
+        if self.noise_floor_db is None:
+            self.noise_floor_db = min(float(np.min(levels)), config.initial_noise_floor_db)
+        threshold = max(config.threshold_db, self.noise_floor_db + config.noise_margin_db)
+        active = levels > threshold
+        self.frames_seen += len(levels)
+
+        quiet = levels[~active]
+        if len(quiet):
+            self.noise_floor_db = 0.95 * self.noise_floor_db + 0.05 * float(np.mean(quiet))
+
+        event = None
+        min_speech = config.frames(config.min_speech_ms)
+        end_silence = config.frames(config.end_silence_ms)
+        for is_active in active.tolist():
+            if is_active:
+                self._speech_run += 1
+                self._silence_run = 0
+                if not self.in_speech and self._speech_run >= min_speech:
+                    self.in_speech = True
+                    event = "start"
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+                if self.in_speech and self._silence_run >= end_silence:
+                    self.in_speech = False
+                    return "end"
+        return event
@@ -1,35 +1,41 @@
-import os
+"""Smoke-test one Realtime round trip: send an audio item, print the reply events.
+
+By default this starts the local mock server, so it needs no network
+access or API key. Pass --live to hit the endpoint in OPENAI_REALTIME_URL
+with your OPENAI_API_KEY instead.
+"""
 import asyncio
+import argparse
 import websockets
 import json
 from dotenv import load_dotenv
 
+from realtime_example.audio_buffer import b64encode_pcm
+from realtime_example.mock_realtime_server import MockRealtimeServer, sine_pcm16
+from realtime_example.realtime_session import REALTIME_URL, realtime_headers
+
 # Ensure environment variables are loaded
 load_dotenv()
 
-async def connect_to_openai_websocket(audio_event):
-    api_key = os.getenv('OPENAI_API_KEY')
-
-    if not api_key:
-        print("API Key not found! Exiting connection attempt.")
-        return
-
-    url = "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-10-01"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "OpenAI-Beta": "realtime=v1"
+async def connect_to_openai_websocket(url, headers):
+    audio_event = {
+        "type": "conversation.item.create",
+        "item": {
+            "type": "message",
+            "role": "user",
+            "content": [{"type": "input_audio", "audio": b64encode_pcm(sine_pcm16(1.0))}]
+        }
     }
-    
+
     try:
         async with websockets.connect(url, extra_headers=headers) as ws:
             print("Connected to server.")
-            await ws.send(audio_event)
+            await ws.send(json.dumps(audio_event))
             print("Audio event sent.")
 
             response_message = {
                 "type": "response.create",
                 "response": {
-                    "modalities": ["text"],
                     "instructions": "Please respond in a friendly manner."
                 }
             }
@@ -38,11 +44,29 @@ async def connect_to_openai_websocket(audio_event):
 
             async for message in ws:
                 event = json.loads(message)
+                if 'delta' in event and event.get('type') == 'response.audio.delta':
+                    event['delta'] = f"<{len(event['delta'])} base64 chars>"
                 print("Received message:", event)
+                if event.get('type') in ('response.done', 'error'):
+                    break
 
     except websockets.exceptions.InvalidStatusCode as e:
         print(f"Connection failed with status code: {e.status_code}")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
-asyncio.run(connect_to_openai_websocket("Test Audio Event"))
\ No newline at end of file
+async def main(live):
+    if live:
+        headers = realtime_headers()
+        if headers["Authorization"] == "Bearer None":
+            print("API Key not found! Exiting connection attempt.")
+            return
+        await connect_to_openai_websocket(REALTIME_URL, headers)
+    else:
+        async with MockRealtimeServer() as server:
+            await connect_to_openai_websocket(server.url, {})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="use the real Realtime API")
+    asyncio.run(main(parser.parse_args().live))